@@ -16,8 +16,7 @@ Quick Start:
     >>> from softlight_automation_framework.llm import OpenAIClient
     >>> 
     >>> async def main():
-    ...     llm = OpenAIClient(model="gpt-4o")
-    ...     async with BrowserSession() as browser:
+    ...     async with OpenAIClient(model="gpt-4o") as llm, BrowserSession() as browser:
     ...         agent = Agent(task="Your task", llm=llm, browser=browser)
     ...         result = await agent.run()
     ...     return result
@@ -52,10 +52,10 @@ class Agent:
     6. Repeat until done or max steps reached
     
     Usage:
-        async with BrowserSession() as browser:
+        async with OpenAIClient() as llm, BrowserSession() as browser:
             agent = Agent(
                 task="Search for Python tutorials on Google",
-                llm=OpenAIClient(),
+                llm=llm,
                 browser=browser,
             )
             result = await agent.run()
@@ -454,9 +454,7 @@ async def run_agent(
     Returns:
         AgentHistoryList with results
     """
-    llm = OpenAIClient(model=model)
-    
-    async with BrowserSession(headless=headless) as browser:
+    async with OpenAIClient(model=model) as llm, BrowserSession(headless=headless) as browser:
         agent = Agent(
             task=task,
             llm=llm,
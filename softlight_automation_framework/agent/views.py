@@ -9,6 +9,12 @@ from uuid import uuid4
 from softlight_automation_framework.tools.views import ActionResult
 from softlight_automation_framework.llm.schema import AgentOutput, AgentBrain
 
+try:
+    # Faster JSON encoder for large histories (optional)
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class AgentSettings(BaseModel):
     """Configuration settings for the agent."""
@@ -319,7 +325,18 @@ class AgentHistoryList(BaseModel, Generic[T]):
         import json
         from pathlib import Path
         
-        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if orjson is not None:
+            # Datetimes go through default=str to match the json output
+            path.write_bytes(orjson.dumps(
+                self.to_dict(),
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ))
+            return
+        
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(self.to_dict(), f, indent=2, default=str)
 
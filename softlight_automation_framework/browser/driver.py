@@ -1,10 +1,11 @@
 """Browser driver using Playwright for browser automation."""
 
 import asyncio
-import base64
 import logging
+import weakref
+from array import array
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Literal, Mapping, Optional, Tuple, Union
 from playwright.async_api import (
     async_playwright,
     Browser,
@@ -28,9 +29,142 @@ from softlight_automation_framework.browser.views import (
     TabInfo,
 )
 
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib encoder
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
+
 logger = logging.getLogger(__name__)
 
 
+class _SelectorMap(Mapping[int, Dict[str, Any]]):
+    """
+    Read-only selector map served from the driver's click-target columns.
+    
+    Holds no per-element dicts: an entry is assembled from the element
+    list and the center/xpath columns only when it is looked up.
+    """
+    
+    __slots__ = ("_elements", "_centers", "_xpaths")
+    
+    def __init__(
+        self,
+        elements: List[InteractiveElement],
+        centers: array,
+        xpaths: List[Optional[str]]
+    ):
+        self._elements = elements
+        self._centers = centers
+        self._xpaths = xpaths
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if not isinstance(index, int) or not 0 < index < len(self._xpaths):
+            raise KeyError(index)
+        element = self._elements[index - 1]
+        offset = 2 * index
+        return {
+            "xpath": self._xpaths[index],
+            "attributes": element.attributes,
+            "tag_name": element.tag_name,
+            "center_x": self._centers[offset],
+            "center_y": self._centers[offset + 1],
+        }
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(1, len(self._xpaths)))
+    
+    def __len__(self) -> int:
+        return len(self._xpaths) - 1
+
+# Collects visible interactive elements in a single layout pass
+_INTERACTIVE_ELEMENTS_JS = """
+() => {
+    // Single selector covering every interactive tag, role and attribute
+    const selector = [
+        'a', 'button', 'input', 'select', 'textarea', 'label',
+        '[role=button]', '[role=link]', '[role=menuitem]', '[role=option]',
+        '[role=tab]', '[role=checkbox]', '[role=radio]',
+        '[onclick]', '[tabindex]', '[contenteditable=true]'
+    ].join(',');
+    const candidates = document.body ? document.body.querySelectorAll(selector) : [];
+    
+    // Pass 1: read every rect in one batch (single layout)
+    const rects = Array.from(candidates, (el) => el.getBoundingClientRect());
+    
+    // Pass 2: computed styles only for nodes with a non-empty box
+    const elements = [];
+    let index = 1;
+    for (let i = 0; i < candidates.length; i++) {
+        const rect = rects[i];
+        if (rect.width <= 0 || rect.height <= 0) continue;
+        
+        const node = candidates[i];
+        const style = window.getComputedStyle(node);
+        if (
+            style.display === 'none' ||
+            style.visibility === 'hidden' ||
+            style.opacity === '0'
+        ) continue;
+        
+        const attrs = {};
+        for (const attr of node.attributes) {
+            attrs[attr.name] = attr.value;
+        }
+        
+        elements.push({
+            index: index,
+            tagName: node.tagName.toLowerCase(),
+            text: node.innerText?.slice(0, 200) || '',
+            attributes: attrs,
+            x: rect.x,
+            y: rect.y,
+            width: rect.width,
+            height: rect.height,
+            role: node.getAttribute('role'),
+            ariaLabel: node.getAttribute('aria-label'),
+            isEditable: ['input', 'textarea'].includes(node.tagName.toLowerCase()) ||
+                       node.getAttribute('contenteditable') === 'true',
+            xpath: getXPath(node)
+        });
+        index++;
+    }
+    
+    function getXPath(el) {
+        if (el.id) return '//*[@id="' + el.id + '"]';
+        if (el === document.body) return '/html/body';
+        
+        let ix = 0;
+        const siblings = el.parentNode?.childNodes || [];
+        for (let i = 0; i < siblings.length; i++) {
+            const sibling = siblings[i];
+            if (sibling === el) {
+                return getXPath(el.parentNode) + '/' + el.tagName.toLowerCase() + '[' + (ix + 1) + ']';
+            }
+            if (sibling.nodeType === 1 && sibling.tagName === el.tagName) {
+                ix++;
+            }
+        }
+        return '';
+    }
+    
+    return elements;
+}
+"""
+
+# Page info and interactive elements in one evaluation
+_PAGE_STATE_JS = """
+() => ({
+    title: document.title,
+    scrollX: window.scrollX || window.pageXOffset,
+    scrollY: window.scrollY || window.pageYOffset,
+    pageWidth: document.documentElement.scrollWidth,
+    pageHeight: document.documentElement.scrollHeight,
+    elements: (""" + _INTERACTIVE_ELEMENTS_JS + """)()
+})
+"""
+
+
 class BrowserDriver:
     """
     Low-level browser driver using Playwright and CDP.
@@ -47,7 +181,21 @@ class BrowserDriver:
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._cdp_session: Optional[CDPSession] = None
-        self._selector_map: Dict[int, Dict[str, Any]] = {}
+        # Keyed by the page itself so a recycled id() can never return
+        # another page's session; entries drop when the page closes
+        self._cdp_sessions: "weakref.WeakKeyDictionary[Page, CDPSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._accessibility_lock = asyncio.Lock()
+        # Compact click targets indexed by element index (slot 0 unused):
+        # centers holds (center_x, center_y) pairs, xpaths runs in parallel
+        self._centers = array("d", (0.0, 0.0))
+        self._xpaths: List[Optional[str]] = [None]
+        # Bumped by anything that may move elements (navigation, scrolling,
+        # input, scripts, tab changes); compared against the revision the
+        # stored centers were extracted at
+        self._layout_rev = 0
+        self._extraction_rev = -1
     
     async def launch(self) -> None:
         """Launch the browser instance."""
@@ -82,11 +230,7 @@ class BrowserDriver:
         self._page = await self._context.new_page()
         
         # Set up CDP session for advanced operations
-        self._cdp_session = await self._page.context.new_cdp_session(self._page)
-        
-        # Enable DOM and accessibility
-        await self._cdp_session.send("DOM.enable")
-        await self._cdp_session.send("Accessibility.enable")
+        self._cdp_session = await self._ensure_cdp(self._page)
         
         logger.info(f"Browser launched (headless={self.config.headless})")
     
@@ -94,9 +238,14 @@ class BrowserDriver:
         """Close the browser instance."""
         logger.info("Closing browser...")
         
-        if self._cdp_session:
-            await self._cdp_session.detach()
-            self._cdp_session = None
+        for cdp_session in list(self._cdp_sessions.values()):
+            try:
+                await cdp_session.detach()
+            except Exception:
+                # Session already gone with its page
+                pass
+        self._cdp_sessions.clear()
+        self._cdp_session = None
         
         if self._context:
             await self._context.close()
@@ -112,6 +261,26 @@ class BrowserDriver:
         
         logger.info("Browser closed")
     
+    async def _ensure_cdp(self, page: Page) -> CDPSession:
+        """
+        Get the CDP session for a page, creating it on first use.
+        
+        Sessions are cached per page so tab switches reuse the existing
+        session instead of repeating the attach handshake. No domains are
+        enabled up front: DOMSnapshot works without them, and the
+        Accessibility domain is only enabled while the AX tree is fetched.
+        """
+        cdp_session = self._cdp_sessions.get(page)
+        if cdp_session is None:
+            cdp_session = await page.context.new_cdp_session(page)
+            self._cdp_sessions[page] = cdp_session
+            page.on("close", self._forget_cdp)
+        return cdp_session
+    
+    def _forget_cdp(self, page: Page) -> None:
+        """Drop the cached CDP session of a closed page."""
+        self._cdp_sessions.pop(page, None)
+    
     @property
     def page(self) -> Page:
         """Get the current page."""
@@ -137,6 +306,7 @@ class BrowserDriver:
         
         try:
             logger.info(f"Navigating to: {url}")
+            self._layout_rev += 1
             await self.page.goto(
                 url,
                 wait_until=wait_until,
@@ -149,6 +319,7 @@ class BrowserDriver:
     async def go_back(self) -> None:
         """Navigate back in history."""
         try:
+            self._layout_rev += 1
             await self.page.go_back()
             logger.debug("Navigated back")
         except Exception as e:
@@ -156,6 +327,7 @@ class BrowserDriver:
     
     async def reload(self) -> None:
         """Reload the current page."""
+        self._layout_rev += 1
         await self.page.reload()
         logger.debug("Page reloaded")
     
@@ -174,28 +346,34 @@ class BrowserDriver:
     async def screenshot(
         self,
         full_page: bool = False,
-        path: Optional[str] = None
-    ) -> str:
+        path: Optional[str] = None,
+        return_bytes: bool = False
+    ) -> Union[str, bytes]:
         """
         Take a screenshot and return as base64.
         
         Args:
             full_page: Capture full scrollable page
             path: Optional path to save screenshot
+            return_bytes: Return raw PNG bytes instead of base64
             
         Returns:
-            Base64 encoded screenshot
+            Base64 encoded screenshot (raw PNG bytes if return_bytes is set)
         """
-        screenshot_bytes = await self.page.screenshot(
-            full_page=full_page,
-            type="png"
-        )
+        data = await self.screenshot_bytes(full_page=full_page)
         
         if path:
-            Path(path).write_bytes(screenshot_bytes)
+            Path(path).write_bytes(data)
             logger.debug(f"Screenshot saved: {path}")
         
-        return base64.b64encode(screenshot_bytes).decode("utf-8")
+        if return_bytes:
+            return data
+        
+        return _b64.b64encode(data).decode("ascii")
+    
+    async def screenshot_bytes(self, full_page: bool = False) -> bytes:
+        """Take a screenshot and return the raw PNG bytes."""
+        return await self.page.screenshot(full_page=full_page, type="png")
     
     async def _wait_for_loading_overlays(self, timeout: float = 10.0) -> None:
         """
@@ -241,6 +419,25 @@ class BrowserDriver:
         except Exception as e:
             logger.debug(f"Loading overlay wait skipped: {e}")
     
+    def _element_target(self, index: int) -> Tuple[float, float, Optional[str]]:
+        """Get (center_x, center_y, xpath) for an element index."""
+        if not 0 < index < len(self._xpaths):
+            raise ElementNotFoundError(
+                f"index={index}",
+                "Element not found in selector map"
+            )
+        offset = 2 * index
+        return self._centers[offset], self._centers[offset + 1], self._xpaths[index]
+    
+    def _stored_center_valid(self, x: float, y: float) -> bool:
+        """Check whether a stored center still points at its element."""
+        if self._layout_rev != self._extraction_rev:
+            return False
+        viewport = self.page.viewport_size
+        if not viewport:
+            return False
+        return 0 <= x < viewport["width"] and 0 <= y < viewport["height"]
+    
     async def click_element(
         self,
         index: int,
@@ -262,12 +459,7 @@ class BrowserDriver:
         """
         import asyncio
         
-        element_info = self._selector_map.get(index)
-        if not element_info:
-            raise ElementNotFoundError(
-                f"index={index}",
-                "Element not found in selector map"
-            )
+        center_x, center_y, xpath = self._element_target(index)
         
         async def _attempt_click(use_force: bool = False) -> Dict[str, Any]:
             """Attempt to click with optional force."""
@@ -275,11 +467,12 @@ class BrowserDriver:
             await self._wait_for_loading_overlays()
             
             # Use stored coordinates directly
-            x = element_info.get("center_x")
-            y = element_info.get("center_y")
+            x = center_x
+            y = center_y
             
-            if x is not None and y is not None and not use_force:
+            if not use_force:
                 # Perform click at stored coordinates
+                self._layout_rev += 1
                 await self.page.mouse.click(
                     x, y,
                     button=button,
@@ -289,10 +482,20 @@ class BrowserDriver:
                 return {"click_x": x, "click_y": y}
             
             # Use XPath with force option
-            xpath = element_info.get("xpath")
             if xpath:
                 locator = self.page.locator(f"xpath={xpath}")
+                # An element already in the viewport is not scrolled, so the
+                # stored center stays accurate unless the layout has changed
+                stored_valid = self._stored_center_valid(x, y)
+                self._layout_rev += 1
                 await locator.click(button=button, click_count=click_count, force=use_force, timeout=10000)
+                
+                if stored_valid:
+                    logger.debug(f"Clicked element {index} via xpath at ({x}, {y}) [force={use_force}]")
+                    return {"click_x": x, "click_y": y}
+                
+                # locator.click scrolled the element into view, so the stored
+                # center is stale; report where the element is now
                 box = await locator.bounding_box()
                 if box:
                     x = box["x"] + box["width"] / 2
@@ -329,6 +532,7 @@ class BrowserDriver:
         button: str = "left"
     ) -> None:
         """Click at specific coordinates."""
+        self._layout_rev += 1
         await self.page.mouse.click(x, y, button=button)
         logger.debug(f"Clicked at ({x}, {y})")
     
@@ -348,19 +552,14 @@ class BrowserDriver:
             clear: Clear existing content first
             delay: Delay between keystrokes in ms
         """
-        element_info = self._selector_map.get(index)
-        if not element_info:
-            raise ElementNotFoundError(
-                f"index={index}",
-                "Element not found in selector map"
-            )
+        x, y, xpath = self._element_target(index)
+        self._layout_rev += 1
         
         try:
             # Wait for loading overlays to disappear
             await self._wait_for_loading_overlays()
             
             # Try XPath first (most reliable)
-            xpath = element_info.get("xpath")
             if xpath:
                 locator = self.page.locator(f"xpath={xpath}")
                 
@@ -385,21 +584,14 @@ class BrowserDriver:
                 return
             
             # Fallback: Click at coordinates then type
-            x = element_info.get("center_x")
-            y = element_info.get("center_y")
+            await self.page.mouse.click(x, y)
             
-            if x is not None and y is not None:
-                await self.page.mouse.click(x, y)
-                
-                if clear:
-                    await self.page.keyboard.press("Control+a")
-                    await self.page.keyboard.press("Backspace")
-                
-                await self.page.keyboard.type(text, delay=delay)
-                logger.debug(f"Typed {len(text)} chars into element {index} at ({x}, {y})")
-                return
+            if clear:
+                await self.page.keyboard.press("Control+a")
+                await self.page.keyboard.press("Backspace")
             
-            raise BrowserError(f"Could not find element {index}")
+            await self.page.keyboard.type(text, delay=delay)
+            logger.debug(f"Typed {len(text)} chars into element {index} at ({x}, {y})")
             
         except Exception as e:
             raise BrowserError(f"Failed to type into element {index}: {e}")
@@ -435,13 +627,13 @@ class BrowserDriver:
         elif direction == "left":
             delta_x = -amount
         
+        self._layout_rev += 1
         if element_index is not None:
             # Scroll element
-            element_info = self._selector_map.get(element_index)
-            if element_info:
+            if 0 < element_index < len(self._xpaths):
                 script = f"""
                     const el = document.evaluate(
-                        '{element_info.get("xpath", "//")}',
+                        '{self._xpaths[element_index] or "//"}',
                         document,
                         null,
                         XPathResult.FIRST_ORDERED_NODE_TYPE,
@@ -464,6 +656,7 @@ class BrowserDriver:
             keys: Space-separated keys (e.g., "Enter", "Tab Tab ArrowDown")
         """
         key_list = keys.split()
+        self._layout_rev += 1
         for key in key_list:
             await self.page.keyboard.press(key)
             await asyncio.sleep(0.05)
@@ -494,27 +687,30 @@ class BrowserDriver:
     
     async def get_tabs(self) -> List[TabInfo]:
         """Get information about all open tabs."""
-        tabs = []
-        for i, page in enumerate(self._context.pages):
-            try:
-                title = await page.title()
-            except Exception:
-                title = ""
-            tabs.append(TabInfo(
+        pages = self._context.pages
+        # Titles are independent round-trips, so fetch them concurrently
+        titles = await asyncio.gather(
+            *(page.title() for page in pages),
+            return_exceptions=True
+        )
+        return [
+            TabInfo(
                 target_id=str(i),
                 url=page.url,
-                title=title,
+                title="" if isinstance(title, BaseException) else title,
                 is_active=(page == self._page)
-            ))
-        return tabs
+            )
+            for i, (page, title) in enumerate(zip(pages, titles))
+        ]
     
     async def switch_tab(self, index: int) -> None:
         """Switch to a different tab by index."""
         pages = self._context.pages
         if 0 <= index < len(pages):
             self._page = pages[index]
+            self._layout_rev += 1
             await self._page.bring_to_front()
-            self._cdp_session = await self._page.context.new_cdp_session(self._page)
+            self._cdp_session = await self._ensure_cdp(self._page)
             logger.debug(f"Switched to tab {index}")
         else:
             raise BrowserError(f"Invalid tab index: {index}")
@@ -523,7 +719,8 @@ class BrowserDriver:
         """Open a new tab."""
         new_page = await self._context.new_page()
         self._page = new_page
-        self._cdp_session = await self._page.context.new_cdp_session(self._page)
+        self._layout_rev += 1
+        self._cdp_session = await self._ensure_cdp(self._page)
         
         if url:
             await self.navigate(url)
@@ -542,17 +739,19 @@ class BrowserDriver:
             raise BrowserError(f"Invalid tab index: {index}")
         
         await page_to_close.close()
+        self._layout_rev += 1
         
         # Switch to another tab if needed
         if page_to_close == self._page and len(self._context.pages) > 0:
             self._page = self._context.pages[-1]
-            self._cdp_session = await self._page.context.new_cdp_session(self._page)
+            self._cdp_session = await self._ensure_cdp(self._page)
         
         logger.debug(f"Closed tab {index if index is not None else 'current'}")
     
     async def execute_script(self, script: str) -> Any:
         """Execute JavaScript in the page."""
         try:
+            self._layout_rev += 1
             result = await self.page.evaluate(script)
             return result
         except Exception as e:
@@ -570,6 +769,29 @@ class BrowserDriver:
         except Exception as e:
             raise TimeoutError("wait_for_selector", timeout)
     
+    async def wait_for_function(
+        self,
+        expression: str,
+        arg: Any = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Wait until a JavaScript predicate returns a truthy value.
+        
+        The predicate is evaluated inside the page, so no round-trip is
+        made per check.
+        
+        Args:
+            expression: JavaScript function source
+            arg: Optional argument passed to the function
+            timeout: Timeout in milliseconds
+        """
+        timeout = timeout if timeout is not None else self.config.timeout
+        try:
+            await self.page.wait_for_function(expression, arg=arg, timeout=timeout)
+        except Exception as e:
+            raise TimeoutError("wait_for_function", timeout)
+    
     async def wait_for_load_state(
         self,
         state: str = "domcontentloaded"
@@ -577,7 +799,10 @@ class BrowserDriver:
         """Wait for a specific load state."""
         await self.page.wait_for_load_state(state)
     
-    async def get_dom_snapshot(self) -> Dict[str, Any]:
+    async def get_dom_snapshot(
+        self,
+        level: Literal["lean", "full"] = "lean"
+    ) -> Dict[str, Any]:
         """
         Get a comprehensive DOM snapshot using CDP.
         
@@ -585,22 +810,32 @@ class BrowserDriver:
         - Document structure
         - Computed styles
         - Layout information
+        
+        Args:
+            level: "lean" requests only the visibility styles; "full" adds
+                opacity/position/overflow/pointer-events and paint order
+        
+        Note:
+            captureSnapshot has no ``includeUserAgentShadowTree`` option
+            (only the deprecated getSnapshot does), so user-agent shadow
+            roots cannot be excluded here; the optional blended-color and
+            text-opacity outputs stay at their ``False`` defaults.
         """
         if not self._cdp_session:
             raise BrowserError("CDP session not available")
         
+        params: Dict[str, Any] = {"includeDOMRects": True}
+        if level == "full":
+            params["computedStyles"] = [
+                "display", "visibility", "opacity",
+                "position", "overflow", "pointer-events"
+            ]
+            params["includePaintOrder"] = True
+        else:
+            params["computedStyles"] = ["display", "visibility"]
+        
         # Get DOM snapshot with layout info
-        snapshot = await self._cdp_session.send(
-            "DOMSnapshot.captureSnapshot",
-            {
-                "computedStyles": [
-                    "display", "visibility", "opacity",
-                    "position", "overflow", "pointer-events"
-                ],
-                "includePaintOrder": True,
-                "includeDOMRects": True
-            }
-        )
+        snapshot = await self._cdp_session.send("DOMSnapshot.captureSnapshot", params)
         
         return snapshot
     
@@ -609,112 +844,42 @@ class BrowserDriver:
         if not self._cdp_session:
             raise BrowserError("CDP session not available")
         
-        tree = await self._cdp_session.send("Accessibility.getFullAXTree")
+        # Keeping the domain enabled makes Chrome recompute the AX tree on
+        # every layout, so only enable it for the duration of this call
+        async with self._accessibility_lock:
+            cdp_session = self._cdp_session
+            await cdp_session.send("Accessibility.enable")
+            try:
+                tree = await cdp_session.send("Accessibility.getFullAXTree")
+            finally:
+                try:
+                    await cdp_session.send("Accessibility.disable")
+                except Exception:
+                    pass
         return tree
     
-    async def get_interactive_elements(self) -> Tuple[List[InteractiveElement], Dict[int, Dict]]:
+    async def get_interactive_elements(self) -> Tuple[List[InteractiveElement], Mapping[int, Dict]]:
         """
         Extract all interactive elements from the page.
         
         Returns:
             Tuple of (elements list, selector map)
         """
-        # JavaScript to extract interactive elements
-        script = """
-        () => {
-            const isVisible = (el) => {
-                const style = window.getComputedStyle(el);
-                const rect = el.getBoundingClientRect();
-                return (
-                    style.display !== 'none' &&
-                    style.visibility !== 'hidden' &&
-                    style.opacity !== '0' &&
-                    rect.width > 0 &&
-                    rect.height > 0
-                );
-            };
-            
-            const isInteractive = (el) => {
-                const tag = el.tagName.toLowerCase();
-                const role = el.getAttribute('role');
-                const clickable = ['a', 'button', 'input', 'select', 'textarea', 'label'];
-                const interactiveRoles = ['button', 'link', 'menuitem', 'option', 'tab', 'checkbox', 'radio'];
-                
-                return (
-                    clickable.includes(tag) ||
-                    interactiveRoles.includes(role) ||
-                    el.hasAttribute('onclick') ||
-                    el.hasAttribute('tabindex') ||
-                    el.getAttribute('contenteditable') === 'true'
-                );
-            };
-            
-            const elements = [];
-            const walker = document.createTreeWalker(
-                document.body,
-                NodeFilter.SHOW_ELEMENT,
-                null,
-                false
-            );
-            
-            let index = 1;
-            let node;
-            while (node = walker.nextNode()) {
-                if (isVisible(node) && isInteractive(node)) {
-                    const rect = node.getBoundingClientRect();
-                    const attrs = {};
-                    for (const attr of node.attributes) {
-                        attrs[attr.name] = attr.value;
-                    }
-                    
-                    elements.push({
-                        index: index,
-                        tagName: node.tagName.toLowerCase(),
-                        text: node.innerText?.slice(0, 200) || '',
-                        attributes: attrs,
-                        x: rect.x,
-                        y: rect.y,
-                        width: rect.width,
-                        height: rect.height,
-                        role: node.getAttribute('role'),
-                        ariaLabel: node.getAttribute('aria-label'),
-                        isEditable: ['input', 'textarea'].includes(node.tagName.toLowerCase()) ||
-                                   node.getAttribute('contenteditable') === 'true',
-                        xpath: getXPath(node)
-                    });
-                    index++;
-                }
-            }
-            
-            function getXPath(el) {
-                if (el.id) return '//*[@id="' + el.id + '"]';
-                if (el === document.body) return '/html/body';
-                
-                let ix = 0;
-                const siblings = el.parentNode?.childNodes || [];
-                for (let i = 0; i < siblings.length; i++) {
-                    const sibling = siblings[i];
-                    if (sibling === el) {
-                        return getXPath(el.parentNode) + '/' + el.tagName.toLowerCase() + '[' + (ix + 1) + ']';
-                    }
-                    if (sibling.nodeType === 1 && sibling.tagName === el.tagName) {
-                        ix++;
-                    }
-                }
-                return '';
-            }
-            
-            return elements;
-        }
-        """
-        
-        raw_elements = await self.page.evaluate(script)
-        
+        raw_elements = await self.page.evaluate(_INTERACTIVE_ELEMENTS_JS)
+        return self._build_elements(raw_elements)
+    
+    def _build_elements(
+        self,
+        raw_elements: List[Dict[str, Any]]
+    ) -> Tuple[List[InteractiveElement], Mapping[int, Dict]]:
+        """Build elements and click targets from extraction script output."""        
         elements = []
-        self._selector_map = {}
+        centers = array("d", (0.0, 0.0))
+        xpaths: List[Optional[str]] = [None]
         
         for raw in raw_elements:
-            element = InteractiveElement(
+            # Script output is already typed, so skip model validation
+            element = InteractiveElement.unchecked(
                 index=raw["index"],
                 tag_name=raw["tagName"],
                 text=raw["text"],
@@ -732,49 +897,56 @@ class BrowserDriver:
             )
             elements.append(element)
             
-            self._selector_map[raw["index"]] = {
-                "xpath": raw.get("xpath"),
-                "attributes": raw["attributes"],
-                "tag_name": raw["tagName"],
-                "center_x": raw["x"] + raw["width"] / 2,
-                "center_y": raw["y"] + raw["height"] / 2,
-            }
+            # Indices are assigned sequentially from 1 by the script
+            centers.append(raw["x"] + raw["width"] / 2)
+            centers.append(raw["y"] + raw["height"] / 2)
+            xpaths.append(raw.get("xpath"))
         
-        return elements, self._selector_map
+        self._centers = centers
+        self._xpaths = xpaths
+        self._extraction_rev = self._layout_rev
+        
+        return elements, _SelectorMap(elements, centers, xpaths)
     
     async def get_browser_state(self) -> BrowserState:
         """Get the complete current browser state."""
-        # Get basic page info
-        url = await self.get_url()
-        title = await self.get_title()
+        state, _ = await self.get_state_and_elements()
+        return state
+    
+    async def get_state_and_elements(self) -> Tuple[BrowserState, Mapping[int, Dict]]:
+        """
+        Get the browser state together with the selector map.
         
-        # Get viewport and scroll info
-        viewport = await self.get_viewport_size()
-        scroll = await self.get_scroll_position()
+        Page info, scroll position and interactive elements come from a
+        single page evaluation instead of separate round-trips.
         
-        # Get tabs
-        tabs = await self.get_tabs()
+        Returns:
+            Tuple of (browser state, selector map)
+        """
+        raw = await self.page.evaluate(_PAGE_STATE_JS)
+        elements, selector_map = self._build_elements(raw["elements"])
         
-        # Get interactive elements
-        elements, _ = await self.get_interactive_elements()
+        viewport = await self.get_viewport_size()
+        tabs = await self.get_tabs()
         
-        # Take screenshot
-        screenshot = await self.screenshot()
+        # Raw PNG; base64 is only produced if something asks for it
+        screenshot = await self.screenshot_bytes()
         
-        return BrowserState(
-            url=url,
-            title=title,
+        state = BrowserState(
+            url=self.page.url,
+            title=raw["title"],
             viewport_width=viewport["width"],
             viewport_height=viewport["height"],
-            scroll_x=scroll["x"],
-            scroll_y=scroll["y"],
-            page_width=scroll["pageWidth"],
-            page_height=scroll["pageHeight"],
+            scroll_x=raw["scrollX"],
+            scroll_y=raw["scrollY"],
+            page_width=raw["pageWidth"],
+            page_height=raw["pageHeight"],
             tabs=tabs,
             active_tab_id=str(self._context.pages.index(self._page)) if self._page else None,
             elements=elements,
-            screenshot_b64=screenshot,
+            screenshot_bytes=screenshot,
         )
+        return state, selector_map
     
     async def highlight_element(
         self,
@@ -783,11 +955,10 @@ class BrowserDriver:
         duration_ms: int = 1000
     ) -> None:
         """Highlight an element temporarily for debugging."""
-        element_info = self._selector_map.get(index)
-        if not element_info:
+        if not 0 < index < len(self._xpaths):
             return
         
-        xpath = element_info.get("xpath")
+        xpath = self._xpaths[index]
         if xpath:
             script = f"""
                 const el = document.evaluate(
@@ -1,15 +1,48 @@
 """Browser event system for handling async browser operations."""
 
 import asyncio
-from dataclasses import dataclass, field
+import contextvars
+import inspect
+from collections import defaultdict, deque
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 import logging
+import threading
+import weakref
+
+from softlight_automation_framework.core.exceptions import BrowserError
 
 logger = logging.getLogger(__name__)
 
+# Buses whose handlers are running in the current context. A handler that
+# dispatches on the same bus already holds a slot, so its dispatch must
+# not wait for another one
+_active_buses: contextvars.ContextVar[Tuple["BrowserEventBus", ...]] = (
+    contextvars.ContextVar("active_event_buses", default=())
+)
+
+# Shared loop used by BrowserEventBus.dispatch_sync
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting its thread on first use."""
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                name="browser-event-loop",
+                daemon=True
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
 
 class EventType(str, Enum):
     """Types of browser events."""
@@ -27,25 +60,52 @@ class EventType(str, Enum):
     SEND_KEYS = "send_keys"
 
 
-@dataclass
+@dataclass(slots=True)
 class BrowserEvent(ABC):
     """Base class for browser events."""
     
     event_type: EventType = field(init=False)
     timestamp: datetime = field(default_factory=datetime.now)
-    _result: Any = field(default=None, init=False)
-    _exception: Optional[Exception] = field(default=None, init=False)
-    _completed: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _future: Optional[asyncio.Future] = field(default=None, init=False)
     
-    def set_result(self, result: Any) -> None:
-        """Set the event result and mark as completed."""
-        self._result = result
-        self._completed.set()
+    def _get_future(self) -> asyncio.Future:
+        """Get the completion future, creating it on the running loop."""
+        if self._future is None:
+            self._future = asyncio.get_running_loop().create_future()
+        return self._future
+    
+    def done(self) -> bool:
+        """Check whether the event has completed."""
+        return self._future is not None and self._future.done()
+    
+    @property
+    def result(self) -> Any:
+        """Get the result if the event completed successfully, else None."""
+        if self.done() and self._future.exception() is None:
+            return self._future.result()
+        return None
+    
+    @property
+    def exception(self) -> Optional[BaseException]:
+        """Get the exception the event completed with, if any."""
+        if self.done():
+            return self._future.exception()
+        return None
     
-    def set_exception(self, exception: Exception) -> None:
-        """Set an exception and mark as completed."""
-        self._exception = exception
-        self._completed.set()
+    def set_result(self, result: Any) -> None:
+        """Set the event result and mark as completed (first call wins)."""
+        future = self._get_future()
+        if not future.done():
+            future.set_result(result)
+    
+    def set_exception(self, exception: BaseException) -> None:
+        """Set an exception and mark as completed (first call wins)."""
+        future = self._get_future()
+        if not future.done():
+            future.set_exception(exception)
+            # The bus logs handler errors itself; don't let asyncio warn
+            # about events whose result is never awaited
+            future.exception()
     
     async def wait_for_result(
         self,
@@ -54,17 +114,18 @@ class BrowserEvent(ABC):
     ) -> Any:
         """Wait for the event to complete and return the result."""
         try:
-            await asyncio.wait_for(self._completed.wait(), timeout=timeout)
+            return await asyncio.wait_for(
+                asyncio.shield(self._get_future()), timeout=timeout
+            )
         except asyncio.TimeoutError:
             raise TimeoutError(f"Event {self.event_type} timed out after {timeout}s")
-        
-        if self._exception and raise_on_error:
-            raise self._exception
-        
-        return self._result
+        except Exception:
+            if raise_on_error:
+                raise
+            return None
 
 
-@dataclass
+@dataclass(slots=True)
 class NavigationEvent(BrowserEvent):
     """Navigate to a URL."""
     
@@ -76,7 +137,7 @@ class NavigationEvent(BrowserEvent):
         self.event_type = EventType.NAVIGATION
 
 
-@dataclass
+@dataclass(slots=True)
 class ClickEvent(BrowserEvent):
     """Click on an element."""
     
@@ -91,7 +152,7 @@ class ClickEvent(BrowserEvent):
         self.event_type = EventType.CLICK
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeEvent(BrowserEvent):
     """Type text into an element."""
     
@@ -105,7 +166,7 @@ class TypeEvent(BrowserEvent):
         self.event_type = EventType.TYPE
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrollEvent(BrowserEvent):
     """Scroll the page or an element."""
     
@@ -117,7 +178,7 @@ class ScrollEvent(BrowserEvent):
         self.event_type = EventType.SCROLL
 
 
-@dataclass
+@dataclass(slots=True)
 class WaitEvent(BrowserEvent):
     """Wait for a condition or time."""
     
@@ -129,7 +190,7 @@ class WaitEvent(BrowserEvent):
         self.event_type = EventType.WAIT
 
 
-@dataclass
+@dataclass(slots=True)
 class ScreenshotEvent(BrowserEvent):
     """Take a screenshot."""
     
@@ -140,7 +201,7 @@ class ScreenshotEvent(BrowserEvent):
         self.event_type = EventType.SCREENSHOT
 
 
-@dataclass
+@dataclass(slots=True)
 class TabSwitchEvent(BrowserEvent):
     """Switch to a different tab."""
     
@@ -150,7 +211,7 @@ class TabSwitchEvent(BrowserEvent):
         self.event_type = EventType.TAB_SWITCH
 
 
-@dataclass
+@dataclass(slots=True)
 class TabCloseEvent(BrowserEvent):
     """Close a tab."""
     
@@ -160,7 +221,7 @@ class TabCloseEvent(BrowserEvent):
         self.event_type = EventType.TAB_CLOSE
 
 
-@dataclass
+@dataclass(slots=True)
 class GoBackEvent(BrowserEvent):
     """Navigate back in history."""
     
@@ -168,7 +229,7 @@ class GoBackEvent(BrowserEvent):
         self.event_type = EventType.GO_BACK
 
 
-@dataclass
+@dataclass(slots=True)
 class UploadFileEvent(BrowserEvent):
     """Upload a file to an input element."""
     
@@ -179,7 +240,7 @@ class UploadFileEvent(BrowserEvent):
         self.event_type = EventType.UPLOAD
 
 
-@dataclass
+@dataclass(slots=True)
 class DropdownEvent(BrowserEvent):
     """Interact with a dropdown element."""
     
@@ -191,7 +252,7 @@ class DropdownEvent(BrowserEvent):
         self.event_type = EventType.DROPDOWN
 
 
-@dataclass
+@dataclass(slots=True)
 class SendKeysEvent(BrowserEvent):
     """Send keyboard keys."""
     
@@ -204,13 +265,132 @@ class SendKeysEvent(BrowserEvent):
 EventHandler = Callable[[BrowserEvent], Any]
 
 
+class _EventPool:
+    """
+    Freelist of reusable events for high-frequency event types.
+    
+    Only completed events are taken back, so an event still referenced
+    by a running handler is never handed out again.
+    """
+    
+    def __init__(self, cls: type, max_size: int = 64):
+        self._cls = cls
+        self._max_size = max_size
+        self._free: List[BrowserEvent] = []
+        self._defaults = [
+            (f.name, f.default, f.default_factory)
+            for f in fields(cls) if f.init
+        ]
+    
+    def acquire(self, **kwargs: Any) -> BrowserEvent:
+        """Get a reset event with the given field values."""
+        if not self._free:
+            return self._cls(**kwargs)
+        
+        event = self._free.pop()
+        for name, default, factory in self._defaults:
+            if name in kwargs:
+                value = kwargs.pop(name)
+            elif factory is not MISSING:
+                value = factory()
+            else:
+                value = default
+            setattr(event, name, value)
+        if kwargs:
+            raise TypeError(f"Unexpected fields for {self._cls.__name__}: {', '.join(kwargs)}")
+        event._future = None
+        return event
+    
+    def release(self, event: BrowserEvent) -> None:
+        """Return an event to the pool once it has completed."""
+        if event.done() and len(self._free) < self._max_size:
+            self._free.append(event)
+
+
+class _SyncHandler:
+    """
+    Awaitable adapter for a synchronous handler.
+    
+    Compares and hashes equal to the wrapped handler so it can be
+    unsubscribed using the original callable.
+    """
+    
+    __slots__ = ("handler",)
+    
+    def __init__(self, handler: EventHandler):
+        self.handler = handler
+    
+    async def __call__(self, event: BrowserEvent) -> Any:
+        result = self.handler(event)
+        # e.g. a lambda or functools.partial wrapping an async function
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, _SyncHandler):
+            other = other.handler
+        return self.handler == other
+    
+    def __hash__(self) -> int:
+        return hash(self.handler)
+
+
+def _as_async(handler: EventHandler) -> EventHandler:
+    """Wrap a synchronous handler so dispatch can always await it."""
+    if inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+        getattr(handler, "__call__", None)
+    ):
+        return handler
+    return _SyncHandler(handler)
+
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+
 class BrowserEventBus:
     """Event bus for browser operations."""
     
-    def __init__(self):
-        self._handlers: Dict[EventType, List[EventHandler]] = {}
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        max_pending: int = 1024,
+        overflow_policy: OverflowPolicy = "block",
+    ):
+        """
+        Initialize the event bus.
+        
+        Args:
+            max_concurrent: Maximum events whose handlers run at once
+                (per event loop; dispatch_sync uses its own loop)
+            max_pending: Maximum events queued or in flight
+            overflow_policy: What to do when max_pending is reached -
+                "block" waits for room, "drop_oldest" sheds the oldest
+                pending event, "drop_newest" rejects the incoming event
+        """
+        if overflow_policy not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(f"Invalid overflow policy: {overflow_policy}")
+        
+        self._handlers: Dict[EventType, List[EventHandler]] = defaultdict(list)
         self._global_handlers: List[EventHandler] = []
-        self._pending_events: List[BrowserEvent] = []
+        # Keyed by id() since dataclass events are unhashable; dict order
+        # keeps the oldest pending event first
+        self._pending_events: Dict[int, BrowserEvent] = {}
+        # Subset of pending events still waiting for a handler slot
+        self._waiting_events: Dict[int, BrowserEvent] = {}
+        
+        # Backpressure. A semaphore binds to the first loop that waits on
+        # it, so each loop (caller's and dispatch_sync's) gets its own
+        self._max_pending = max_pending
+        self._max_concurrent = max_concurrent
+        self._overflow_policy = overflow_policy
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Dispatches blocked on a full queue, woken in arrival order; each
+        # future belongs to its dispatcher's loop
+        self._room_waiters: Deque[asyncio.Future] = deque()
+        self._dropped = 0
     
     def subscribe(
         self,
@@ -218,13 +398,11 @@ class BrowserEventBus:
         handler: EventHandler
     ) -> None:
         """Subscribe a handler to a specific event type."""
-        if event_type not in self._handlers:
-            self._handlers[event_type] = []
-        self._handlers[event_type].append(handler)
+        self._handlers[event_type].append(_as_async(handler))
     
     def subscribe_all(self, handler: EventHandler) -> None:
         """Subscribe a handler to all events."""
-        self._global_handlers.append(handler)
+        self._global_handlers.append(_as_async(handler))
     
     def unsubscribe(
         self,
@@ -232,70 +410,207 @@ class BrowserEventBus:
         handler: EventHandler
     ) -> None:
         """Unsubscribe a handler from an event type."""
-        if event_type in self._handlers:
-            self._handlers[event_type] = [
-                h for h in self._handlers[event_type] if h != handler
-            ]
+        try:
+            self._handlers[event_type].remove(handler)
+        except ValueError:
+            pass
     
     async def dispatch(self, event: BrowserEvent) -> BrowserEvent:
         """
         Dispatch an event to all subscribed handlers.
         
-        Returns the event with result set after handlers complete.
+        Handlers for the event type run concurrently, followed by the
+        global handlers. Returns the event with result set after
+        handlers complete.
+        
+        A dispatch made from inside one of this bus's handlers runs
+        straight away, outside the queue and concurrency limits, since
+        waiting for a slot its caller holds could deadlock.
         """
-        self._pending_events.append(event)
+        # Nothing to run: complete immediately without queue bookkeeping
+        if not self._global_handlers and not self._handlers.get(event.event_type):
+            event.set_result(None)
+            return event
         
+        if self in _active_buses.get():
+            await self._run_handlers(event)
+            return event
+        
+        if len(self._pending_events) >= self._max_pending:
+            if self._overflow_policy == "drop_newest":
+                self._drop(event)
+                return event
+            if self._overflow_policy == "drop_oldest" and self._waiting_events:
+                # Only events that have not started can be shed; dropping a
+                # running one would free nothing
+                oldest = next(iter(self._waiting_events))
+                self._pending_events.pop(oldest, None)
+                self._drop(self._waiting_events.pop(oldest))
+            else:
+                while len(self._pending_events) >= self._max_pending:
+                    await self._wait_for_room()
+        
+        self._pending_events[id(event)] = event
+        self._waiting_events[id(event)] = event
+        
+        try:
+            async with self._get_semaphore():
+                self._waiting_events.pop(id(event), None)
+                # Dropped while waiting for a slot
+                if event.done():
+                    return event
+                await self._run_handlers(event)
+        finally:
+            # May already be gone if dropped under drop_oldest
+            if self._pending_events.pop(id(event), None) is not None:
+                self._wake_one()
+            self._waiting_events.pop(id(event), None)
+        
+        return event
+    
+    async def _wait_for_room(self) -> None:
+        """Wait until a pending event finishes (``block`` policy)."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._room_waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Woken just before being cancelled: hand the wakeup on
+            if waiter.done() and not waiter.cancelled():
+                self._wake_one()
+            raise
+    
+    def _wake_one(self) -> None:
+        """Wake the longest-blocked dispatch, if any."""
+        while self._room_waiters:
+            waiter = self._room_waiters.popleft()
+            if waiter.done():
+                continue
+            loop = waiter.get_loop()
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if loop is running:
+                waiter.set_result(None)
+            else:
+                # dispatch_sync runs on another thread's loop
+                loop.call_soon_threadsafe(self._resolve_waiter, waiter)
+            return
+    
+    def _resolve_waiter(self, waiter: asyncio.Future) -> None:
+        """Wake a waiter on its own loop, passing the wakeup on if it is gone."""
+        if waiter.done():
+            self._wake_one()
+        else:
+            waiter.set_result(None)
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrent)
+        return semaphore
+    
+    async def _run_handlers(self, event: BrowserEvent) -> None:
+        """Run specific and global handlers for an event."""
+        # Handler tasks copy this context, so nested dispatches see it
+        token = _active_buses.set(_active_buses.get() + (self,))
         try:
             # Call specific handlers
-            handlers = self._handlers.get(event.event_type, [])
-            for handler in handlers:
-                try:
-                    result = handler(event)
-                    if asyncio.iscoroutine(result):
-                        result = await result
-                    
+            handlers = self._handlers.get(event.event_type)
+            if handlers:
+                results = await asyncio.gather(
+                    *(handler(event) for handler in handlers),
+                    return_exceptions=True
+                )
+                # The first handler error takes precedence over any result
+                error = next(
+                    (r for r in results if isinstance(r, BaseException)), None
+                )
+                if error is not None:
+                    logger.error(f"Event handler error: {error}")
+                    event.set_exception(error)
+                else:
                     # Set result from first successful handler
-                    if result is not None and event._result is None:
+                    result = next((r for r in results if r is not None), None)
+                    if result is not None:
                         event.set_result(result)
-                        
-                except Exception as e:
-                    logger.error(f"Event handler error: {e}")
-                    event.set_exception(e)
-                    break
             
             # Call global handlers
-            for handler in self._global_handlers:
-                try:
-                    result = handler(event)
-                    if asyncio.iscoroutine(result):
-                        await result
-                except Exception as e:
-                    logger.warning(f"Global event handler error: {e}")
+            global_handlers = self._global_handlers
+            if global_handlers:
+                results = await asyncio.gather(
+                    *(handler(event) for handler in global_handlers),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, BaseException):
+                        logger.warning(f"Global event handler error: {result}")
             
             # Mark as completed if not already
-            if not event._completed.is_set():
-                event.set_result(None)
-                
+            event.set_result(None)
         finally:
-            self._pending_events.remove(event)
+            _active_buses.reset(token)
+    
+    def _drop(self, event: BrowserEvent) -> None:
+        """Shed an event when the pending queue is full."""
+        self._dropped += 1
+        logger.warning(
+            f"Event bus full ({self._max_pending} pending), "
+            f"dropping {event.event_type.value} event"
+        )
+        event.set_exception(BrowserError(
+            f"Event {event.event_type.value} dropped: event bus is full"
+        ))
+    
+    def dispatch_sync(
+        self,
+        event: BrowserEvent,
+        timeout: Optional[float] = 30.0
+    ) -> BrowserEvent:
+        """
+        Dispatch an event synchronously (for use in sync contexts).
         
-        return event
-    
-    def dispatch_sync(self, event: BrowserEvent) -> BrowserEvent:
-        """Dispatch an event synchronously (for use in sync contexts)."""
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Create a future and schedule the dispatch
-            future = asyncio.ensure_future(self.dispatch(event))
-            return event
+        The dispatch runs on a shared background event loop and this
+        call blocks until all handlers have completed.
+        
+        Args:
+            event: Event to dispatch
+            timeout: Maximum seconds to wait for handlers
+            
+        Returns:
+            The dispatched event with its result set
+            
+        Raises:
+            RuntimeError: If called from inside a running event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
         else:
-            return loop.run_until_complete(self.dispatch(event))
+            raise RuntimeError(
+                "dispatch_sync() cannot be called from a running event loop; "
+                "use 'await bus.dispatch(event)' instead"
+            )
+        
+        future = asyncio.run_coroutine_threadsafe(
+            self.dispatch(event), _get_background_loop()
+        )
+        return future.result(timeout=timeout)
     
     @property
     def pending_count(self) -> int:
         """Get number of pending events."""
         return len(self._pending_events)
     
+    @property
+    def dropped_count(self) -> int:
+        """Get number of events dropped due to backpressure."""
+        return self._dropped
+    
     def clear_handlers(self) -> None:
         """Clear all event handlers."""
         self._handlers.clear()
@@ -305,9 +620,21 @@ class BrowserEventBus:
 class EventLogger:
     """Logs browser events for debugging and tracing."""
     
-    def __init__(self, event_bus: BrowserEventBus):
+    # Event-specific fields to record, keyed by exact event type
+    _serializers: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+        NavigationEvent: lambda e: {"url": e.url, "new_tab": e.new_tab},
+        ClickEvent: lambda e: {
+            "index": e.index,
+            "coordinates": (e.coordinate_x, e.coordinate_y),
+        },
+        TypeEvent: lambda e: {"index": e.index, "text_length": len(e.text)},
+        ScrollEvent: lambda e: {"direction": e.direction, "amount": e.amount},
+    }
+    
+    def __init__(self, event_bus: BrowserEventBus, max_events: int = 1000):
         self.event_bus = event_bus
-        self.events: List[Dict[str, Any]] = []
+        # Oldest entries are dropped once max_events is reached
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
         event_bus.subscribe_all(self._log_event)
     
     def _log_event(self, event: BrowserEvent) -> None:
@@ -318,25 +645,17 @@ class EventLogger:
         }
         
         # Add event-specific fields
-        if isinstance(event, NavigationEvent):
-            event_data["url"] = event.url
-            event_data["new_tab"] = event.new_tab
-        elif isinstance(event, ClickEvent):
-            event_data["index"] = event.index
-            event_data["coordinates"] = (event.coordinate_x, event.coordinate_y)
-        elif isinstance(event, TypeEvent):
-            event_data["index"] = event.index
-            event_data["text_length"] = len(event.text)
-        elif isinstance(event, ScrollEvent):
-            event_data["direction"] = event.direction
-            event_data["amount"] = event.amount
+        serializer = self._serializers.get(type(event))
+        if serializer:
+            event_data.update(serializer(event))
         
         self.events.append(event_data)
-        logger.debug(f"Browser event: {event_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Browser event: %s", event_data)
     
     def get_events(self) -> List[Dict[str, Any]]:
         """Get all logged events."""
-        return self.events.copy()
+        return list(self.events)
     
     def clear(self) -> None:
         """Clear logged events."""
@@ -1,15 +1,23 @@
 """Browser session management with state tracking and event handling."""
 
 import asyncio
+import itertools
 import logging
+import time
+from collections import deque
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Callable, Tuple
 from uuid import uuid4
 
 from softlight_automation_framework.core.config import BrowserConfig, Config
-from softlight_automation_framework.core.exceptions import BrowserError, SessionExpiredError
+from softlight_automation_framework.core.exceptions import (
+    BrowserError,
+    SessionExpiredError,
+    TimeoutError,
+)
 from softlight_automation_framework.browser.driver import BrowserDriver
 from softlight_automation_framework.browser.events import (
     BrowserEventBus,
@@ -25,6 +33,7 @@ from softlight_automation_framework.browser.events import (
     SendKeysEvent,
     EventLogger,
     EventType,
+    _EventPool,
 )
 from softlight_automation_framework.browser.views import (
     BrowserState,
@@ -34,6 +43,25 @@ from softlight_automation_framework.browser.views import (
 
 logger = logging.getLogger(__name__)
 
+# Process-wide sequence for session ids; count() is atomic under the GIL
+_SESSION_COUNTER = itertools.count()
+
+# True once the given text appears in the page; text is passed as an argument
+_WAIT_TEXT_JS = "(t) => document.body.innerText.includes(t)"
+
+# Visible page text without script and style contents
+_PAGE_TEXT_JS = """
+() => {
+    // Remove script and style elements
+    const clone = document.body.cloneNode(true);
+    clone.querySelectorAll('script, style, noscript').forEach(el => el.remove());
+    return clone.innerText;
+}
+"""
+
+# Seconds extracted page text stays valid when no action has touched the DOM
+_CONTENT_CACHE_TTL = 2.0
+
 
 class BrowserSession:
     """
@@ -57,6 +85,7 @@ class BrowserSession:
         save_screenshots: bool = False,
         screenshots_dir: str = "./screenshots",
         session_file: Optional[str] = None,
+        history_limit: int = 200,
     ):
         """
         Initialize a browser session.
@@ -69,6 +98,7 @@ class BrowserSession:
             timeout: Default timeout in milliseconds
             save_screenshots: Save screenshots to disk
             screenshots_dir: Directory for saved screenshots
+            history_limit: Maximum state history entries kept in memory
         """
         if config:
             self.config = config
@@ -80,7 +110,7 @@ class BrowserSession:
                 timeout=timeout,
             )
         
-        self.session_id = str(uuid4())[:8]
+        self.session_id = f"{next(_SESSION_COUNTER):06d}-{uuid4().hex[:8]}"
         self.save_screenshots = save_screenshots
         self.screenshots_dir = Path(screenshots_dir)
         self.session_file = session_file
@@ -90,11 +120,23 @@ class BrowserSession:
         self._event_bus = BrowserEventBus()
         self._event_logger = EventLogger(self._event_bus)
         
+        # Reused events for the highest-frequency actions
+        self._click_events = _EventPool(ClickEvent)
+        self._scroll_events = _EventPool(ScrollEvent)
+        self._send_keys_events = _EventPool(SendKeysEvent)
+        
         # State tracking
         self._current_state: Optional[BrowserState] = None
         self._previous_state: Optional[BrowserState] = None
-        self._state_history: List[BrowserStateHistory] = []
-        self._selector_map: Dict[int, Dict[str, Any]] = {}
+        self._state_history: Deque[BrowserStateHistory] = deque(maxlen=history_limit)
+        self._selector_map: Mapping[int, Dict[str, Any]] = {}
+        
+        # Extracted page text and its capture time, keyed by (url, DOM revision)
+        self._content_cache: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        self._dom_rev = 0
+        
+        # Viewport size, cleared whenever the active page may change
+        self._viewport_cache: Optional[Dict[str, int]] = None
         
         # Session tracking
         self._is_active = False
@@ -117,8 +159,16 @@ class BrowserSession:
         self._event_bus.subscribe(EventType.GO_BACK, self._handle_go_back)
         self._event_bus.subscribe(EventType.SEND_KEYS, self._handle_send_keys)
     
+    def _invalidate_content(self) -> None:
+        """Bump the DOM revision after an action that may mutate the page."""
+        self._dom_rev += 1
+        self._content_cache.clear()
+    
     async def _handle_navigation(self, event: NavigationEvent) -> Dict[str, Any]:
         """Handle navigation events."""
+        self._invalidate_content()
+        if event.new_tab:
+            self._viewport_cache = None
         try:
             if event.new_tab:
                 await self._driver.new_tab(event.url)
@@ -126,11 +176,12 @@ class BrowserSession:
                 await self._driver.navigate(event.url, wait_until=event.wait_until)
             return {"url": event.url, "new_tab": event.new_tab}
         except Exception as e:
-            logger.error(f"Navigation failed: {e}")
+            logger.error("Navigation failed: %s", e)
             raise
     
     async def _handle_click(self, event: ClickEvent) -> Dict[str, Any]:
         """Handle click events."""
+        self._invalidate_content()
         if event.index is not None:
             result = await self._driver.click_element(
                 event.index,
@@ -150,6 +201,7 @@ class BrowserSession:
     
     async def _handle_type(self, event: TypeEvent) -> None:
         """Handle type events."""
+        self._invalidate_content()
         await self._driver.type_text(
             event.index,
             event.text,
@@ -162,6 +214,7 @@ class BrowserSession:
     
     async def _handle_scroll(self, event: ScrollEvent) -> None:
         """Handle scroll events."""
+        self._invalidate_content()
         await self._driver.scroll(
             direction=event.direction,
             amount=event.amount,
@@ -170,38 +223,41 @@ class BrowserSession:
     
     async def _handle_wait(self, event: WaitEvent) -> None:
         """Handle wait events."""
+        self._invalidate_content()
         if event.selector:
             await self._driver.wait_for_selector(event.selector)
         elif event.text:
-            # Wait for text to appear
-            script = f"""
-                () => {{
-                    return document.body.innerText.includes('{event.text}');
-                }}
-            """
-            start = datetime.now()
-            while (datetime.now() - start).total_seconds() < event.seconds:
-                if await self._driver.execute_script(script):
-                    return
-                await asyncio.sleep(0.1)
+            # Wait for text to appear, giving up quietly after the timeout
+            try:
+                await self._driver.wait_for_function(
+                    _WAIT_TEXT_JS, event.text, timeout=event.seconds * 1000
+                )
+            except TimeoutError:
+                pass
         else:
             await asyncio.sleep(event.seconds)
     
     async def _handle_tab_switch(self, event: TabSwitchEvent) -> str:
         """Handle tab switch events."""
+        self._invalidate_content()
+        self._viewport_cache = None
         await self._driver.switch_tab(int(event.target_id))
         return event.target_id
     
     async def _handle_tab_close(self, event: TabCloseEvent) -> None:
         """Handle tab close events."""
+        self._invalidate_content()
+        self._viewport_cache = None
         await self._driver.close_tab(int(event.target_id))
     
     async def _handle_go_back(self, event: GoBackEvent) -> None:
         """Handle go back events."""
+        self._invalidate_content()
         await self._driver.go_back()
     
     async def _handle_send_keys(self, event: SendKeysEvent) -> None:
         """Handle send keys events."""
+        self._invalidate_content()
         await self._driver.send_keys(event.keys)
     
     async def start(self) -> "BrowserSession":
@@ -235,6 +291,7 @@ class BrowserSession:
             await self._driver.close()
             self._driver = None
         
+        self._viewport_cache = None
         self._is_active = False
         self._event_bus.clear_handlers()
     
@@ -280,14 +337,14 @@ class BrowserSession:
         return self._current_state
     
     @property
-    def selector_map(self) -> Dict[int, Dict[str, Any]]:
-        """Get the current selector map."""
-        return self._selector_map
+    def selector_map(self) -> Mapping[int, Dict[str, Any]]:
+        """Get a read-only view of the current selector map."""
+        return MappingProxyType(self._selector_map)
     
     @property
-    def downloaded_files(self) -> List[str]:
-        """Get list of downloaded files."""
-        return self._downloaded_files.copy()
+    def downloaded_files(self) -> Tuple[str, ...]:
+        """Get the downloaded files."""
+        return tuple(self._downloaded_files)
     
     async def get_state(self, force_refresh: bool = False) -> BrowserState:
         """
@@ -304,16 +361,13 @@ class BrowserSession:
         if not force_refresh and self._current_state:
             return self._current_state
         
-        # Get fresh state from driver
-        state = await self._driver.get_browser_state()
+        # Get fresh state and selector map from driver in one pass
+        state, self._selector_map = await self._driver.get_state_and_elements()
         
         # Mark new elements
         if self._previous_state:
             state.mark_new_elements(self._previous_state)
         
-        # Update selector map
-        _, self._selector_map = await self._driver.get_interactive_elements()
-        
         # Update state tracking
         self._previous_state = self._current_state
         self._current_state = state
@@ -321,16 +375,15 @@ class BrowserSession:
         # Save screenshot if enabled
         if self.save_screenshots:
             screenshot_path = self.screenshots_dir / f"step_{self._step_count:03d}.png"
-            if state.screenshot_b64:
-                import base64
-                screenshot_path.write_bytes(base64.b64decode(state.screenshot_b64))
+            if state.screenshot_bytes:
+                screenshot_path.write_bytes(state.screenshot_bytes)
                 state.screenshot_path = str(screenshot_path)
         
-        # Add to history
+        # Add to history; saved screenshots are re-read from disk on demand
         self._state_history.append(BrowserStateHistory(
             url=state.url,
             title=state.title,
-            screenshot_b64=state.screenshot_b64,
+            screenshot_b64=None if state.screenshot_path else state.screenshot_b64,
             screenshot_path=state.screenshot_path,
         ))
         
@@ -342,7 +395,7 @@ class BrowserSession:
             return self._current_state.get_element_by_index(index)
         return None
     
-    async def get_selector_map(self) -> Dict[int, Dict[str, Any]]:
+    async def get_selector_map(self) -> Mapping[int, Dict[str, Any]]:
         """Get the selector map for element interactions."""
         if not self._selector_map:
             await self.get_state(force_refresh=True)
@@ -364,9 +417,12 @@ class BrowserSession:
         y: Optional[int] = None
     ) -> Dict[str, Any]:
         """Click on an element or coordinates."""
-        event = ClickEvent(index=index, coordinate_x=x, coordinate_y=y)
-        await self._event_bus.dispatch(event)
-        result = await event.wait_for_result()
+        event = self._click_events.acquire(index=index, coordinate_x=x, coordinate_y=y)
+        try:
+            await self._event_bus.dispatch(event)
+            result = await event.wait_for_result()
+        finally:
+            self._click_events.release(event)
         self._step_count += 1
         return result or {}
     
@@ -390,12 +446,22 @@ class BrowserSession:
         element_index: Optional[int] = None
     ) -> None:
         """Scroll the page or an element."""
-        viewport = await self._driver.get_viewport_size()
+        viewport = self._viewport_cache or await self._get_viewport()
         amount = int(pages * viewport["height"])
         
-        event = ScrollEvent(direction=direction, amount=amount, index=element_index)
-        await self._event_bus.dispatch(event)
-        await event.wait_for_result()
+        event = self._scroll_events.acquire(
+            direction=direction, amount=amount, index=element_index
+        )
+        try:
+            await self._event_bus.dispatch(event)
+            await event.wait_for_result()
+        finally:
+            self._scroll_events.release(event)
+    
+    async def _get_viewport(self) -> Dict[str, int]:
+        """Fetch and cache the viewport size of the active page."""
+        self._viewport_cache = await self._driver.get_viewport_size()
+        return self._viewport_cache
     
     async def wait(self, seconds: float = 1.0) -> None:
         """Wait for a specified time."""
@@ -412,9 +478,12 @@ class BrowserSession:
     
     async def send_keys(self, keys: str) -> None:
         """Send keyboard keys."""
-        event = SendKeysEvent(keys=keys)
-        await self._event_bus.dispatch(event)
-        await event.wait_for_result()
+        event = self._send_keys_events.acquire(keys=keys)
+        try:
+            await self._event_bus.dispatch(event)
+            await event.wait_for_result()
+        finally:
+            self._send_keys_events.release(event)
     
     async def switch_tab(self, tab_id: str) -> None:
         """Switch to a different tab."""
@@ -436,6 +505,7 @@ class BrowserSession:
     async def execute_script(self, script: str) -> Any:
         """Execute JavaScript in the page."""
         self._ensure_active()
+        self._invalidate_content()
         return await self._driver.execute_script(script)
     
     async def extract_content(self, query: str) -> str:
@@ -447,21 +517,27 @@ class BrowserSession:
         """
         self._ensure_active()
         
+        # The DOM revision only tracks our own actions; pages that update
+        # themselves (polling, timers, SPAs) are covered by a short TTL
+        key = (self.current_url, self._dom_rev)
+        cached = self._content_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < _CONTENT_CACHE_TTL:
+            return cached[0]
+        
         # Get page text content
-        content = await self._driver.execute_script("""
-            () => {
-                // Remove script and style elements
-                const clone = document.body.cloneNode(true);
-                clone.querySelectorAll('script, style, noscript').forEach(el => el.remove());
-                return clone.innerText;
-            }
-        """)
+        content = await self._driver.execute_script(_PAGE_TEXT_JS)
         
+        self._content_cache[key] = (content, now)
         return content
     
     def get_history(self) -> List[BrowserStateHistory]:
         """Get the state history."""
-        return self._state_history.copy()
+        return list(self._state_history)
+    
+    def iter_history(self) -> Iterator[BrowserStateHistory]:
+        """Iterate over the state history without copying it."""
+        return iter(self._state_history)
     
     def get_event_log(self) -> List[Dict[str, Any]]:
         """Get the event log."""
@@ -1,10 +1,27 @@
 """Data models for browser state and operations."""
 
+import io
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field
+
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib encoder
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
+
+
+# Characters allowed in a URL scheme (RFC 3986); the first must be a letter
+_SCHEME_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-."
+)
 
 
 class BrowserStateType(str, Enum):
@@ -16,7 +33,7 @@ class BrowserStateType(str, Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class ViewportInfo:
     """Information about the browser viewport."""
     width: int
@@ -34,7 +51,7 @@ class ViewportInfo:
         return int(self.height / self.device_pixel_ratio)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrollPosition:
     """Current scroll position of a page or element."""
     x: float = 0.0
@@ -63,21 +80,25 @@ class ScrollPosition:
         return (self.max_y - self.y) / max(self.max_y, 1)
 
 
-@dataclass
+@dataclass(slots=True)
 class TabInfo:
     """Information about a browser tab."""
     target_id: str
     url: str
     title: str
     is_active: bool = False
+    _short_id: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._short_id = self.target_id[-4:]
     
     @property
     def short_id(self) -> str:
         """Get last 4 characters of target ID for display."""
-        return self.target_id[-4:] if len(self.target_id) >= 4 else self.target_id
+        return self._short_id
 
 
-@dataclass
+@dataclass(slots=True)
 class PageInfo:
     """Information about the current page."""
     url: str
@@ -86,18 +107,46 @@ class PageInfo:
     scroll: ScrollPosition
     ready_state: str = "complete"
     is_pdf: bool = False
+    # (url, domain) pair from the last domain lookup
+    _domain: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     @property
     def domain(self) -> str:
         """Extract domain from URL."""
-        from urllib.parse import urlparse
-        parsed = urlparse(self.url)
-        return parsed.netloc
+        url = self.url
+        if self._domain is not None and self._domain[0] == url:
+            return self._domain[1]
+        
+        # Fast path for absolute URLs: netloc runs up to the first / ? or #.
+        # Only when "://" ends a valid scheme (not e.g. "javascript:...://")
+        scheme_end = url.find("://")
+        if (
+            scheme_end > 0
+            and url[0].isascii() and url[0].isalpha()
+            and _SCHEME_CHARS.issuperset(url[:scheme_end])
+        ):
+            rest = url[scheme_end + 3:]
+            end = len(rest)
+            for sep in "/?#":
+                i = rest.find(sep, 0, end)
+                if i != -1:
+                    end = i
+            domain = rest[:end]
+        else:
+            domain = urlparse(url).netloc
+        
+        self._domain = (url, domain)
+        return domain
 
 
 class InteractiveElement(BaseModel):
     """An interactive element on the page."""
     
+    # Build the validator on first use rather than at import
+    model_config = ConfigDict(defer_build=True)
+    
     index: int = Field(description="Unique index for referencing")
     tag_name: str = Field(description="HTML tag name")
     text: str = Field(default="", description="Visible text content")
@@ -124,6 +173,27 @@ class InteractiveElement(BaseModel):
     depth: int = Field(default=0, description="Nesting depth")
     is_new: bool = Field(default=False, description="Element appeared since last state")
     
+    # Rendered to_llm_string output keyed by (include_position, is_new)
+    _llm_cache: Optional[Dict[Tuple[bool, bool], str]] = PrivateAttr(default=None)
+    _tag_lower: Optional[str] = PrivateAttr(default=None)
+    
+    @classmethod
+    def unchecked(cls, **kwargs: Any) -> "InteractiveElement":
+        """
+        Build an element without validation.
+        
+        Only for trusted input such as the driver's extraction script,
+        whose output already has the right types.
+        """
+        return cls.model_construct(**kwargs)
+    
+    @property
+    def tag_name_lower(self) -> str:
+        """Get the lowercased tag name, computed once."""
+        if self._tag_lower is None:
+            self._tag_lower = self.tag_name.lower()
+        return self._tag_lower
+    
     @property
     def center_x(self) -> float:
         """Get center X coordinate."""
@@ -140,32 +210,41 @@ class InteractiveElement(BaseModel):
     
     def to_llm_string(self, include_position: bool = False) -> str:
         """Format element for LLM consumption."""
-        prefix = "*" if self.is_new else ""
-        attrs = []
+        key = (include_position, self.is_new)
+        if self._llm_cache is None:
+            self._llm_cache = {}
+        else:
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        tag = self.tag_name
+        attributes = self.attributes
+        parts = ["*" if self.is_new else "", "[", str(self.index), "]<", tag]
         
-        # Add key attributes
+        # Add key attributes, each preceded by a space
         if self.aria_label:
-            attrs.append(f"aria-label='{self.aria_label}'")
+            parts += (" aria-label='", self.aria_label, "'")
         if self.role:
-            attrs.append(f"role='{self.role}'")
-        if "placeholder" in self.attributes:
-            attrs.append(f"placeholder='{self.attributes['placeholder']}'")
-        if "type" in self.attributes and self.tag_name.lower() == "input":
-            attrs.append(f"type='{self.attributes['type']}'")
-        if "href" in self.attributes:
-            href = self.attributes["href"]
+            parts += (" role='", self.role, "'")
+        if "placeholder" in attributes:
+            parts += (" placeholder='", attributes["placeholder"], "'")
+        if "type" in attributes and self.tag_name_lower == "input":
+            parts += (" type='", attributes["type"], "'")
+        if "href" in attributes:
+            href = attributes["href"]
             if len(href) > 50:
                 href = href[:47] + "..."
-            attrs.append(f"href='{href}'")
-        
-        attr_str = " " + " ".join(attrs) if attrs else ""
-        text = self.text[:50] + "..." if len(self.text) > 50 else self.text
+            parts += (" href='", href, "'")
         
-        result = f"{prefix}[{self.index}]<{self.tag_name}{attr_str}>{text}</{self.tag_name}>"
+        text = self.text
+        parts += (">", text[:50] + "..." if len(text) > 50 else text, "</", tag, ">")
         
         if include_position:
-            result += f" @({self.x:.0f},{self.y:.0f})"
+            parts.append(f" @({self.x:.0f},{self.y:.0f})")
         
+        result = "".join(parts)
+        self._llm_cache[key] = result
         return result
     
     def get_description(self) -> str:
@@ -190,6 +269,8 @@ class InteractiveElement(BaseModel):
 class BrowserState(BaseModel):
     """Complete state of the browser at a point in time."""
     
+    model_config = ConfigDict(defer_build=True)
+    
     # Page information
     url: str = Field(description="Current page URL")
     title: str = Field(description="Page title")
@@ -213,35 +294,72 @@ class BrowserState(BaseModel):
     elements: List[InteractiveElement] = Field(default_factory=list)
     
     # Screenshot
-    screenshot_b64: Optional[str] = Field(default=None, description="Base64 encoded screenshot")
+    screenshot_bytes: Optional[bytes] = Field(
+        default=None, exclude=True, repr=False, description="Raw PNG screenshot"
+    )
     screenshot_path: Optional[str] = Field(default=None, description="Path to saved screenshot")
     
     # State info
     ready_state: str = Field(default="complete")
     is_pdf: bool = Field(default=False)
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp_ns: int = Field(default_factory=time.time_ns, description="Capture time (epoch ns)")
     
     # Previous state for comparison
     previous_url: Optional[str] = Field(default=None)
     
+    _screenshot_b64: Optional[str] = PrivateAttr(default=None)
+    _index_map: Optional[Dict[int, InteractiveElement]] = PrivateAttr(default=None)
+    _by_tag: Optional[Dict[str, List[InteractiveElement]]] = PrivateAttr(default=None)
+    # Derived views paired with the field values they were built from
+    _viewport_view: Optional[Tuple[tuple, ViewportInfo]] = PrivateAttr(default=None)
+    _scroll_view: Optional[Tuple[tuple, ScrollPosition]] = PrivateAttr(default=None)
+    
+    def __init__(self, /, timestamp: Union[datetime, str, None] = None, **data: Any):
+        # The capture time used to be a ``timestamp`` datetime field
+        if timestamp is not None:
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            data.setdefault("timestamp_ns", int(timestamp.timestamp() * 1_000_000_000))
+        super().__init__(**data)
+    
+    @computed_field
+    @property
+    def timestamp(self) -> datetime:
+        """Capture time as a local datetime, converted on access."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+    
+    @computed_field
+    @property
+    def screenshot_b64(self) -> Optional[str]:
+        """Base64 encoded screenshot, encoded on first access."""
+        if self._screenshot_b64 is None and self.screenshot_bytes:
+            self._screenshot_b64 = _b64.b64encode(self.screenshot_bytes).decode("ascii")
+        return self._screenshot_b64
+    
     @property
     def viewport(self) -> ViewportInfo:
         """Get viewport info."""
-        return ViewportInfo(
-            width=self.viewport_width,
-            height=self.viewport_height,
-            device_pixel_ratio=self.device_pixel_ratio
-        )
+        key = (self.viewport_width, self.viewport_height, self.device_pixel_ratio)
+        if self._viewport_view is None or self._viewport_view[0] != key:
+            self._viewport_view = (key, ViewportInfo(*key))
+        return self._viewport_view[1]
     
     @property
     def scroll(self) -> ScrollPosition:
         """Get scroll position."""
-        return ScrollPosition(
-            x=self.scroll_x,
-            y=self.scroll_y,
-            max_x=max(0, self.page_width - self.viewport_width),
-            max_y=max(0, self.page_height - self.viewport_height)
+        key = (
+            self.scroll_x, self.scroll_y,
+            self.page_width, self.page_height,
+            self.viewport_width, self.viewport_height,
         )
+        if self._scroll_view is None or self._scroll_view[0] != key:
+            self._scroll_view = (key, ScrollPosition(
+                x=self.scroll_x,
+                y=self.scroll_y,
+                max_x=max(0, self.page_width - self.viewport_width),
+                max_y=max(0, self.page_height - self.viewport_height)
+            ))
+        return self._scroll_view[1]
     
     @property
     def pages_above(self) -> float:
@@ -268,64 +386,77 @@ class BrowserState(BaseModel):
         """Check if there's content below the viewport."""
         return self.pages_below > 0.1
     
+    def _get_index_map(self) -> Dict[int, InteractiveElement]:
+        """Get the index-to-element map, building it on first use."""
+        # Elements are fixed after construction, so build the map once
+        if self._index_map is None:
+            self._index_map = {e.index: e for e in self.elements}
+        return self._index_map
+    
     def get_element_by_index(self, index: int) -> Optional[InteractiveElement]:
         """Get element by its index."""
-        for element in self.elements:
-            if element.index == index:
-                return element
-        return None
+        return self._get_index_map().get(index)
     
     def get_elements_by_tag(self, tag_name: str) -> List[InteractiveElement]:
         """Get all elements with a specific tag."""
-        return [e for e in self.elements if e.tag_name.lower() == tag_name.lower()]
+        if self._by_tag is None:
+            by_tag: Dict[str, List[InteractiveElement]] = defaultdict(list)
+            for element in self.elements:
+                by_tag[element.tag_name_lower].append(element)
+            self._by_tag = dict(by_tag)
+        return list(self._by_tag.get(tag_name.lower(), ()))
     
     def mark_new_elements(self, previous_state: Optional["BrowserState"]) -> None:
         """Mark elements that are new since the previous state."""
         if not previous_state or self.url != previous_state.url:
             return
         
-        previous_indices = {e.index for e in previous_state.elements}
+        # Reuse the previous state's cached index map for membership tests
+        previous_indices = previous_state._get_index_map()
         for element in self.elements:
-            element.is_new = element.index not in previous_indices
+            # Plain attribute write, skipping BaseModel.__setattr__
+            object.__setattr__(element, "is_new", element.index not in previous_indices)
     
     def to_llm_string(self) -> str:
         """Format browser state for LLM consumption."""
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
         
-        # Page info
-        lines.append(f"Current URL: {self.url}")
-        lines.append(f"Page Title: {self.title}")
+        # Page info; every later line starts with its own newline
+        w(f"Current URL: {self.url}")
+        w(f"\nPage Title: {self.title}")
         
         # Scroll info
-        lines.append(f"<page_info>{self.pages_above:.1f} pages above, {self.pages_below:.1f} pages below</page_info>")
+        w(f"\n<page_info>{self.pages_above:.1f} pages above, {self.pages_below:.1f} pages below</page_info>")
         
         # Tabs
         if len(self.tabs) > 1:
-            lines.append("\nOpen Tabs:")
+            w("\n\nOpen Tabs:")
             for tab in self.tabs:
                 marker = "*" if tab.is_active else " "
-                lines.append(f"  {marker}Tab {tab.short_id}: {tab.title[:30]} - {tab.url[:50]}")
+                w(f"\n  {marker}Tab {tab.short_id}: {tab.title[:30]} - {tab.url[:50]}")
         
         # Elements
-        lines.append("\nInteractive Elements:")
+        w("\n\nInteractive Elements:")
         
         if self.has_content_above:
-            lines.append(f"... {self.pages_above:.1f} pages above ...")
+            w(f"\n... {self.pages_above:.1f} pages above ...")
         else:
-            lines.append("[Start of page]")
+            w("\n[Start of page]")
         
         # Group elements by depth for indentation
         for element in self.elements:
-            indent = "\t" * element.depth
-            lines.append(f"{indent}{element.to_llm_string()}")
+            w("\n")
+            w("\t" * element.depth)
+            w(element.to_llm_string())
         
         if not self.has_content_below:
-            lines.append("[End of page]")
+            w("\n[End of page]")
         
-        return "\n".join(lines)
+        return buf.getvalue()
 
 
-@dataclass
+@dataclass(slots=True)
 class BrowserStateHistory:
     """Historical record of browser state."""
     url: Optional[str]
@@ -333,6 +464,8 @@ class BrowserStateHistory:
     screenshot_b64: Optional[str] = None
     screenshot_path: Optional[str] = None
     interacted_elements: List[Dict[str, Any]] = field(default_factory=list)
+    # Encoded copy of the screenshot file, filled on first get_screenshot()
+    _file_b64: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -347,11 +480,14 @@ class BrowserStateHistory:
         """Get screenshot as base64 string."""
         if self.screenshot_b64:
             return self.screenshot_b64
+        if self._file_b64 is not None:
+            return self._file_b64
         if self.screenshot_path:
-            import base64
-            from pathlib import Path
-            path = Path(self.screenshot_path)
-            if path.exists():
-                return base64.b64encode(path.read_bytes()).decode("utf-8")
+            try:
+                data = Path(self.screenshot_path).read_bytes()
+            except FileNotFoundError:
+                return None
+            self._file_b64 = _b64.b64encode(data).decode("ascii")
+            return self._file_b64
         return None
 
@@ -3,27 +3,28 @@
 import asyncio
 import logging
 import sys
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 import click
 from rich.console import Console
-from rich.logging import RichHandler
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from softlight_automation_framework.core.config import Config
-from softlight_automation_framework.core.logging import setup_logging
-from softlight_automation_framework.browser.session import BrowserSession
-from softlight_automation_framework.llm.openai_client import OpenAIClient
-from softlight_automation_framework.agent.executor import Agent
-from softlight_automation_framework.agent.views import AgentHistoryList
+
+# Browser, LLM and agent modules pull in Playwright and the OpenAI SDK;
+# they are imported inside the commands that need them so that --help
+# and info start quickly
+if TYPE_CHECKING:
+    from softlight_automation_framework.agent.views import AgentHistoryList
 
 console = Console()
 
 
 def setup_cli_logging(verbose: bool = False) -> None:
     """Set up logging for CLI."""
+    from rich.logging import RichHandler
+    
     level = "DEBUG" if verbose else "INFO"
     
     # Use rich handler for pretty output
@@ -52,7 +53,7 @@ async def run_task(
     use_vision: bool = True,
     save_history: Optional[str] = None,
     verbose: bool = False,
-) -> AgentHistoryList:
+) -> "AgentHistoryList":
     """
     Run a browser automation task.
     
@@ -68,14 +69,18 @@ async def run_task(
     Returns:
         AgentHistoryList with results
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    from softlight_automation_framework.browser.session import BrowserSession
+    from softlight_automation_framework.llm.openai_client import OpenAIClient
+    from softlight_automation_framework.agent.executor import Agent
+    
     console.print(Panel(
         f"[bold blue]Task:[/bold blue] {task}",
         title="🤖 Browser Automation Agent",
         border_style="blue"
     ))
     
-    # Initialize LLM
-    llm = OpenAIClient(model=model)
     console.print(f"[dim]Using model: {model}[/dim]")
     
     # Run with progress
@@ -86,7 +91,8 @@ async def run_task(
     ) as progress:
         progress.add_task("Launching browser...", total=None)
         
-        async with BrowserSession(headless=headless) as browser:
+        # Initialize LLM
+        async with OpenAIClient(model=model) as llm, BrowserSession(headless=headless) as browser:
             progress.update(
                 progress.task_ids[0],
                 description="Running agent..."
@@ -113,7 +119,7 @@ async def run_task(
     return history
 
 
-def display_results(history: AgentHistoryList) -> None:
+def display_results(history: "AgentHistoryList") -> None:
     """Display agent results in a nice format."""
     console.print()
     
@@ -146,9 +152,8 @@ def display_results(history: AgentHistoryList) -> None:
         ))
     
     # Visited URLs
-    urls = [u for u in history.urls() if u]
-    if urls:
-        unique_urls = list(dict.fromkeys(urls))[:5]  # Last 5 unique URLs
+    unique_urls = list(dict.fromkeys(u for u in history.urls() if u))[:5]
+    if unique_urls:
         console.print("\n[bold]Visited URLs:[/bold]")
         for url in unique_urls:
             console.print(f"  • {url[:80]}{'...' if len(url) > 80 else ''}")
@@ -226,9 +231,11 @@ def interactive(headless: bool):
     ))
     
     async def interactive_loop():
-        llm = OpenAIClient()
+        from softlight_automation_framework.browser.session import BrowserSession
+        from softlight_automation_framework.llm.openai_client import OpenAIClient
+        from softlight_automation_framework.agent.executor import Agent
         
-        async with BrowserSession(headless=headless) as browser:
+        async with OpenAIClient() as llm, BrowserSession(headless=headless) as browser:
             while True:
                 try:
                     task = console.input("\n[bold blue]Task:[/bold blue] ")
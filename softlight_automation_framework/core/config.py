@@ -1,8 +1,9 @@
 """Configuration management for the browser automation framework."""
 
+import functools
 import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -10,6 +11,84 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _read_env() -> Dict[str, Dict[str, Any]]:
+    """Parse every configuration environment variable into constructor kwargs."""
+    getenv = os.getenv
+    return {
+        "browser": {
+            "headless": getenv("BROWSER_HEADLESS", "false").lower() == "true",
+            "timeout": int(getenv("BROWSER_TIMEOUT", "30000")),
+            "viewport_width": int(getenv("BROWSER_VIEWPORT_WIDTH", "1280")),
+            "viewport_height": int(getenv("BROWSER_VIEWPORT_HEIGHT", "720")),
+            "user_agent": getenv("BROWSER_USER_AGENT"),
+            "ignore_https_errors": getenv("BROWSER_IGNORE_HTTPS_ERRORS", "true").lower() == "true",
+            "slow_mo": int(getenv("BROWSER_SLOW_MO", "0")),
+            "downloads_path": getenv("BROWSER_DOWNLOADS_PATH"),
+        },
+        "llm": {
+            "api_key": getenv("OPENAI_API_KEY", ""),
+            "model": getenv("OPENAI_MODEL", "gpt-4o"),
+            "temperature": float(getenv("OPENAI_TEMPERATURE", "0.0")),
+            "max_tokens": int(getenv("OPENAI_MAX_TOKENS", "4096")),
+            "timeout": int(getenv("OPENAI_TIMEOUT", "60")),
+            "max_concurrency": int(getenv("OPENAI_MAX_CONCURRENCY", "8")),
+            "requests_per_minute": int(getenv("OPENAI_REQUESTS_PER_MINUTE", "0")),
+            "tokens_per_minute": int(getenv("OPENAI_TOKENS_PER_MINUTE", "0")),
+            "exact_cache_size": int(getenv("OPENAI_EXACT_CACHE_SIZE", "128")),
+            "enable_semantic_cache": getenv("OPENAI_SEMANTIC_CACHE", "false").lower() == "true",
+            "semantic_cache_threshold": float(getenv("OPENAI_SEMANTIC_CACHE_THRESHOLD", "0.87")),
+        },
+        "agent": {
+            "max_steps": int(getenv("AGENT_MAX_STEPS", "100")),
+            "max_actions_per_step": int(getenv("AGENT_MAX_ACTIONS_PER_STEP", "4")),
+            "max_failures": int(getenv("AGENT_MAX_FAILURES", "3")),
+            "use_vision": getenv("AGENT_USE_VISION", "true").lower() == "true",
+            "step_timeout": int(getenv("AGENT_STEP_TIMEOUT", "120")),
+        },
+        "config": {
+            "log_level": getenv("LOG_LEVEL", "INFO"),
+            "log_file": getenv("LOG_FILE"),
+            "save_screenshots": getenv("SAVE_SCREENSHOTS", "false").lower() == "true",
+            "screenshots_dir": getenv("SCREENSHOTS_DIR", "./screenshots"),
+            "save_traces": getenv("SAVE_TRACES", "false").lower() == "true",
+            "traces_dir": getenv("TRACES_DIR", "./traces"),
+        },
+    }
+
+
+# Environment snapshot taken at import; refreshed by Config.reload()
+_ENV = _read_env()
+
+# Instances built by from_env, keyed by class; cleared by Config.reload()
+_from_env_cache: Dict[type, BaseModel] = {}
+
+
+def _copy_config(instance: BaseModel) -> BaseModel:
+    """Copy a config and its nested configs, skipping validation."""
+    nested = {
+        name: _copy_config(value)
+        for name, value in instance.__dict__.items()
+        if isinstance(value, BaseModel)
+    }
+    return instance.model_copy(update=nested)
+
+
+def _cached_from_env(func: Callable[[type], Any]) -> Callable[[type], Any]:
+    """
+    Memoize a from_env classmethod per class.
+    
+    The validated instance is kept as a template and every call gets its
+    own copy, so callers can change their config without affecting others.
+    """
+    @functools.wraps(func)
+    def wrapper(cls):
+        instance = _from_env_cache.get(cls)
+        if instance is None:
+            instance = _from_env_cache[cls] = func(cls)
+        return _copy_config(instance)
+    return wrapper
+
+
 class BrowserConfig(BaseModel):
     """Browser-specific configuration."""
     
@@ -47,18 +126,15 @@ class BrowserConfig(BaseModel):
     )
     
     @classmethod
+    @_cached_from_env
     def from_env(cls) -> "BrowserConfig":
-        """Create config from environment variables."""
-        return cls(
-            headless=os.getenv("BROWSER_HEADLESS", "false").lower() == "true",
-            timeout=int(os.getenv("BROWSER_TIMEOUT", "30000")),
-            viewport_width=int(os.getenv("BROWSER_VIEWPORT_WIDTH", "1280")),
-            viewport_height=int(os.getenv("BROWSER_VIEWPORT_HEIGHT", "720")),
-            user_agent=os.getenv("BROWSER_USER_AGENT"),
-            ignore_https_errors=os.getenv("BROWSER_IGNORE_HTTPS_ERRORS", "true").lower() == "true",
-            slow_mo=int(os.getenv("BROWSER_SLOW_MO", "0")),
-            downloads_path=os.getenv("BROWSER_DOWNLOADS_PATH"),
-        )
+        """
+        Create config from environment variables.
+        
+        Values come from the environment snapshot taken at import;
+        call ``Config.reload()`` after changing environment variables.
+        """
+        return cls(**_ENV["browser"])
 
 
 class LLMConfig(BaseModel):
@@ -84,17 +160,41 @@ class LLMConfig(BaseModel):
         default=60,
         description="Request timeout in seconds"
     )
+    max_concurrency: int = Field(
+        default=8,
+        description="Maximum in-flight requests per client"
+    )
+    requests_per_minute: int = Field(
+        default=0,
+        description="Client-side request rate limit (0 disables)"
+    )
+    tokens_per_minute: int = Field(
+        default=0,
+        description="Client-side estimated token rate limit (0 disables)"
+    )
+    exact_cache_size: int = Field(
+        default=128,
+        description="Responses kept for identical deterministic requests (0 disables)"
+    )
+    enable_semantic_cache: bool = Field(
+        default=False,
+        description="Reuse responses for near-duplicate prompts (needs sentence-transformers)"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.87,
+        description="Minimum cosine similarity for a semantic cache hit"
+    )
     
     @classmethod
+    @_cached_from_env
     def from_env(cls) -> "LLMConfig":
-        """Create config from environment variables."""
-        return cls(
-            api_key=os.getenv("OPENAI_API_KEY", ""),
-            model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-            temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.0")),
-            max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "4096")),
-            timeout=int(os.getenv("OPENAI_TIMEOUT", "60")),
-        )
+        """
+        Create config from environment variables.
+        
+        Values come from the environment snapshot taken at import;
+        call ``Config.reload()`` after changing environment variables.
+        """
+        return cls(**_ENV["llm"])
 
 
 class AgentConfig(BaseModel):
@@ -122,15 +222,15 @@ class AgentConfig(BaseModel):
     )
     
     @classmethod
+    @_cached_from_env
     def from_env(cls) -> "AgentConfig":
-        """Create config from environment variables."""
-        return cls(
-            max_steps=int(os.getenv("AGENT_MAX_STEPS", "100")),
-            max_actions_per_step=int(os.getenv("AGENT_MAX_ACTIONS_PER_STEP", "4")),
-            max_failures=int(os.getenv("AGENT_MAX_FAILURES", "3")),
-            use_vision=os.getenv("AGENT_USE_VISION", "true").lower() == "true",
-            step_timeout=int(os.getenv("AGENT_STEP_TIMEOUT", "120")),
-        )
+        """
+        Create config from environment variables.
+        
+        Values come from the environment snapshot taken at import;
+        call ``Config.reload()`` after changing environment variables.
+        """
+        return cls(**_ENV["agent"])
 
 
 class Config(BaseModel):
@@ -166,20 +266,28 @@ class Config(BaseModel):
     )
     
     @classmethod
+    @_cached_from_env
     def from_env(cls) -> "Config":
-        """Create complete config from environment variables."""
+        """
+        Create complete config from environment variables.
+        
+        Values come from the environment snapshot taken at import;
+        call ``Config.reload()`` after changing environment variables.
+        """
         return cls(
             browser=BrowserConfig.from_env(),
             llm=LLMConfig.from_env(),
             agent=AgentConfig.from_env(),
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            log_file=os.getenv("LOG_FILE"),
-            save_screenshots=os.getenv("SAVE_SCREENSHOTS", "false").lower() == "true",
-            screenshots_dir=os.getenv("SCREENSHOTS_DIR", "./screenshots"),
-            save_traces=os.getenv("SAVE_TRACES", "false").lower() == "true",
-            traces_dir=os.getenv("TRACES_DIR", "./traces"),
+            **_ENV["config"],
         )
     
+    @classmethod
+    def reload(cls) -> "Config":
+        """Drop cached from_env results and re-read the environment."""
+        _ENV.update(_read_env())
+        _from_env_cache.clear()
+        return cls.from_env()
+    
     def ensure_directories(self) -> None:
         """Ensure required directories exist."""
         if self.save_screenshots:
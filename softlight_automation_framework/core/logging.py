@@ -1,12 +1,46 @@
 """Logging configuration for the browser automation framework."""
 
+import atexit
+import functools
+import json
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 import structlog
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize a log event with orjson, returning str for stdlib handlers."""
+    return orjson.dumps(
+        obj,
+        default=kwargs.get("default"),
+        option=orjson.OPT_NON_STR_KEYS,
+    ).decode("utf-8")
+
+
+# Background listener that drains queued records to the real handlers
+_queue_listener: Optional[QueueListener] = None
+
+
+def _stop_queue_listener() -> None:
+    """Flush and stop the background logging listener, if running."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
 
 def setup_logging(
     level: str = "INFO",
@@ -31,6 +65,7 @@ def setup_logging(
     if json_logs:
         processors = [
             structlog.stdlib.filter_by_level,
+            structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -38,11 +73,14 @@ def setup_logging(
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(
+                serializer=_orjson_dumps if orjson is not None else json.dumps
+            )
         ]
     else:
         processors = [
             structlog.stdlib.filter_by_level,
+            structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -55,18 +93,24 @@ def setup_logging(
     
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Methods below numeric_level are no-ops, so disabled calls never
+        # reach the processor chain
+        wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
+    # Loggers handed out before reconfiguring are bound to the old chain
+    get_logger.cache_clear()
     
     # Set up root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
-    # Clear existing handlers
+    # Clear existing handlers, draining any previous listener first
+    _stop_queue_listener()
     root_logger.handlers.clear()
+    handlers = []
     
     # Console handler with formatting
     console_handler = logging.StreamHandler(sys.stdout)
@@ -79,7 +123,7 @@ def setup_logging(
         )
         console_handler.setFormatter(console_format)
     
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler if specified
     if log_file:
@@ -94,7 +138,17 @@ def setup_logging(
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         file_handler.setFormatter(file_format)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Log calls only enqueue; a background thread does the stream/file I/O
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    
+    global _queue_listener
+    _queue_listener = QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
     
     # Quiet down noisy libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -110,7 +164,8 @@ def setup_logging(
     return logger
 
 
-def get_logger(name: str = "browser_automation") -> structlog.stdlib.BoundLogger:
+@functools.lru_cache(maxsize=64)
+def get_logger(name: str = "browser_automation") -> structlog.typing.FilteringBoundLogger:
     """
     Get a structlog logger instance.
     
@@ -124,22 +179,34 @@ def get_logger(name: str = "browser_automation") -> structlog.stdlib.BoundLogger
 
 
 class LogContext:
-    """Context manager for adding temporary log context."""
+    """
+    Context manager for adding temporary log context.
+    
+    The context is bound with ``structlog.contextvars``, so it applies to
+    every structlog logger used in the current context (this thread or
+    asyncio task, and tasks created from it), not just ``logger``. The
+    previous values are restored on exit, even when the block raises.
+    
+    Example:
+        with LogContext(logger, step=3) as log:
+            log.info("Clicking")  # includes step=3
+    """
     
-    def __init__(self, logger: structlog.stdlib.BoundLogger, **context):
+    def __init__(self, logger: structlog.typing.FilteringBoundLogger, **context):
         self.logger = logger
         self.context = context
-        self._original_context = {}
+        self._tokens: dict = {}
     
-    def __enter__(self):
-        # Store original context and bind new context
-        self._original_context = self.logger._context.copy()
-        self.logger = self.logger.bind(**self.context)
-        return self.logger
+    def __enter__(self) -> structlog.typing.FilteringBoundLogger:
+        # Bind into the current context; merged into every event logged
+        # within it by the merge_contextvars processor
+        self._tokens = structlog.contextvars.bind_contextvars(**self.context)
+        return self.logger.bind(**self.context)
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # Restore original context
-        self.logger._context = self._original_context
+        # Restore the previous values
+        structlog.contextvars.reset_contextvars(**self._tokens)
+        self._tokens = {}
         return False
 
 
@@ -0,0 +1,67 @@
+"""Optional Numba-compiled kernels for DOM serialization.
+
+Numba is not a required dependency. When it (or NumPy) is missing,
+``HAS_JIT`` is False and callers fall back to their pure-Python paths.
+Numba is only imported, and the kernel compiled, the first time a
+page large enough to use it is serialized.
+"""
+
+import importlib.util
+from array import array
+from typing import Any, Callable, List, Optional
+
+from softlight_automation_framework.dom.views import FLAG_VISIBLE
+
+# Checked without importing, so small pages never pay numba's import time
+HAS_JIT = (
+    importlib.util.find_spec("numpy") is not None
+    and importlib.util.find_spec("numba") is not None
+)
+
+# Below this many elements the Python sort wins over JIT dispatch overhead
+JIT_THRESHOLD = 500
+
+_sort_by_yx: Optional[Callable[[Any, Any], Any]] = None
+
+
+def _get_sort_kernel() -> Callable[[Any, Any], Any]:
+    """Import numba and compile the sort kernel on first use."""
+    global _sort_by_yx
+    if _sort_by_yx is None:
+        import numpy as np
+        from numba import njit
+
+        @njit
+        def sort_by_yx(ys, xs):
+            """Stable permutation ordering rows by Y, then X."""
+            order = np.argsort(xs, kind="mergesort")
+            return order[np.argsort(ys[order], kind="mergesort")]
+
+        _sort_by_yx = sort_by_yx
+    return _sort_by_yx
+
+
+def sort_visible_rows(ys: array, xs: array, flags: array) -> List[int]:
+    """
+    Get rows of visible elements sorted by Y position, then X.
+
+    Matches ``InteractiveElementsSoA.sorted_rows`` (ties keep row order).
+    Only call when ``HAS_JIT`` is True.
+
+    Args:
+        ys: Y positions, one per row (``array('d')``)
+        xs: X positions, one per row (``array('d')``)
+        flags: FLAG_* bitmasks, one per row (``array('B')``)
+
+    Returns:
+        Sorted row numbers
+    """
+    import numpy as np
+
+    sort_by_yx = _get_sort_kernel()
+    rows = np.flatnonzero(np.frombuffer(flags, dtype=np.uint8) & FLAG_VISIBLE)
+    order = sort_by_yx(
+        np.frombuffer(ys, dtype=np.float64)[rows],
+        np.frombuffer(xs, dtype=np.float64)[rows],
+    )
+    return rows[order].tolist()
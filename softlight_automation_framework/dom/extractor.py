@@ -1,11 +1,21 @@
 """DOM extraction using CDP for comprehensive page analysis."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from softlight_automation_framework.dom.views import (
     DOMNode,
     DOMRect,
     DOMState,
+    NodeColumns,
     ComputedStyles,
     AccessibilityInfo,
     NodeType,
@@ -15,6 +25,43 @@ from softlight_automation_framework.dom.views import (
 
 logger = logging.getLogger(__name__)
 
+_NODE_TYPE_BY_VALUE = {nt.value: nt for nt in NodeType}
+
+# Computed styles requested from DOMSnapshot, in request order
+_STYLE_NAMES = (
+    "display", "visibility", "opacity",
+    "position", "overflow", "pointer-events",
+)
+# Matching ComputedStyles field names
+_STYLE_FIELDS = tuple(name.replace("-", "_") for name in _STYLE_NAMES)
+
+
+class _LazyNodeDict(Mapping):
+    """Read-only node_id -> node dict view that converts nodes on first access."""
+    
+    __slots__ = ("_nodes", "_convert", "_cache")
+    
+    def __init__(
+        self,
+        nodes: Dict[int, DOMNode],
+        convert: Callable[[DOMNode], Dict[str, Any]],
+    ):
+        self._nodes = nodes
+        self._convert = convert
+        self._cache: Dict[int, Dict[str, Any]] = {}
+    
+    def __getitem__(self, node_id: int) -> Dict[str, Any]:
+        data = self._cache.get(node_id)
+        if data is None:
+            data = self._cache[node_id] = self._convert(self._nodes[node_id])
+        return data
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._nodes)
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+
 
 class DOMExtractor:
     """
@@ -33,6 +80,7 @@ class DOMExtractor:
         cdp_session: Any,
         viewport_width: int = 1280,
         viewport_height: int = 720,
+        full_tree: bool = True,
     ):
         """
         Initialize the DOM extractor.
@@ -41,14 +89,30 @@ class DOMExtractor:
             cdp_session: CDP session for browser communication
             viewport_width: Browser viewport width
             viewport_height: Browser viewport height
+            full_tree: Fetch the whole DOM, piercing iframes and shadow
+                roots. When False only the top few levels of the main
+                document are requested.
         """
         self.cdp_session = cdp_session
         self.viewport_width = viewport_width
         self.viewport_height = viewport_height
+        self.full_tree = full_tree
         
         self._nodes: Dict[int, DOMNode] = {}
         self._selector_map: Dict[int, Dict[str, Any]] = {}
+        self._index_to_node: Dict[int, DOMNode] = {}
+        self._interactive_nodes: List[DOMNode] = []
         self._interactive_index = 1
+        
+        # Tree nodes with layout, and their bounds as flat x, y, w, h rows
+        self._bounded_nodes: List[DOMNode] = []
+        self._node_bounds = array("d")
+        
+        # Snapshot layout in struct-of-arrays form (see _build_snapshot_lookup)
+        self._bid_to_row: Dict[int, int] = {}
+        self._bounds_arr = array("d")
+        self._has_bounds = bytearray()
+        self._style_rows: List[Optional[ComputedStyles]] = []
     
     async def extract(self) -> Tuple[DOMState, Dict[int, Dict[str, Any]]]:
         """
@@ -59,30 +123,42 @@ class DOMExtractor:
         """
         logger.debug("Extracting DOM...")
         
-        # Get DOM snapshot with styles and layout
-        snapshot = await self._get_dom_snapshot()
-        
-        # Get accessibility tree
-        ax_tree = await self._get_accessibility_tree()
-        
-        # Get DOM tree
-        dom_tree = await self._get_dom_tree()
+        # Start from a clean slate; fresh containers so maps returned by a
+        # previous extract() are left untouched
+        self._nodes = {}
+        self._selector_map = {}
+        self._index_to_node = {}
+        self._interactive_nodes = []
+        self._interactive_index = 1
+        self._bounded_nodes = []
+        self._node_bounds = array("d")
+        
+        # Fetch snapshot, accessibility tree and DOM tree concurrently.
+        # Each helper returns an empty sentinel on failure.
+        snapshot, ax_tree, dom_tree = await asyncio.gather(
+            self._get_dom_snapshot(),
+            self._get_accessibility_tree(),
+            self._get_dom_tree(),
+        )
         
         # Build enhanced DOM tree
-        await self._build_dom_tree(dom_tree, snapshot, ax_tree)
+        self._build_dom_tree(dom_tree, snapshot, ax_tree)
         
-        # Create DOM state
+        # Create DOM state. Full node dicts are built lazily on access;
+        # interactive element dicts are shared with the node view.
+        nodes = _LazyNodeDict(self._nodes, self._node_to_dict)
         state = DOMState(
             root_node_id=dom_tree.get("root", {}).get("nodeId", 0),
-            nodes={n.node_id: self._node_to_dict(n) for n in self._nodes.values()},
+            nodes=nodes,
             interactive_elements={
-                n.index: self._node_to_dict(n)
-                for n in self._nodes.values()
-                if n.index is not None
+                n.index: nodes[n.node_id] for n in self._interactive_nodes
             },
             selector_map=self._selector_map,
             viewport_width=self.viewport_width,
             viewport_height=self.viewport_height,
+            # Statistics columns straight from the nodes, so serializing
+            # does not force every lazy node dict
+            node_columns=self._build_node_columns(),
         )
         
         logger.debug(
@@ -98,11 +174,7 @@ class DOMExtractor:
             result = await self.cdp_session.send(
                 "DOMSnapshot.captureSnapshot",
                 {
-                    "computedStyles": [
-                        "display", "visibility", "opacity",
-                        "position", "overflow", "pointer-events"
-                    ],
-                    "includePaintOrder": True,
+                    "computedStyles": list(_STYLE_NAMES),
                     "includeDOMRects": True,
                 }
             )
@@ -126,16 +198,17 @@ class DOMExtractor:
     async def _get_dom_tree(self) -> Dict[str, Any]:
         """Get DOM tree using CDP."""
         try:
-            result = await self.cdp_session.send(
-                "DOM.getDocument",
-                {"depth": -1, "pierce": True}
-            )
+            if self.full_tree:
+                params = {"depth": -1, "pierce": True}
+            else:
+                params = {"depth": 3, "pierce": False}
+            result = await self.cdp_session.send("DOM.getDocument", params)
             return result
         except Exception as e:
             logger.warning(f"Failed to get DOM tree: {e}")
             return {}
     
-    async def _build_dom_tree(
+    def _build_dom_tree(
         self,
         dom_tree: Dict[str, Any],
         snapshot: DOMSnapshot,
@@ -147,24 +220,25 @@ class DOMExtractor:
             return
         
         # Build lookup tables from snapshot
-        snapshot_lookup = self._build_snapshot_lookup(snapshot)
+        self._build_snapshot_lookup(snapshot)
         ax_lookup = self._build_ax_lookup(ax_tree)
         
-        # Recursively process nodes
-        await self._process_node(
-            root,
-            snapshot_lookup,
-            ax_lookup,
-            parent_id=None,
-            depth=0,
-        )
+        self._process_tree(root, ax_lookup)
     
-    def _build_snapshot_lookup(
-        self,
-        snapshot: DOMSnapshot
-    ) -> Dict[int, Dict[str, Any]]:
-        """Build lookup table from DOM snapshot."""
-        lookup = {}
+    def _build_snapshot_lookup(self, snapshot: DOMSnapshot) -> None:
+        """
+        Build layout tables from DOM snapshot.
+        
+        Layout is stored as parallel arrays rather than one dict per node:
+        bounds go into a flat float buffer (x, y, width, height per row),
+        styles into a list, and ``_bid_to_row`` maps backend node ids to
+        rows. DOMRect objects are only created for nodes that make it
+        into the tree.
+        """
+        bid_to_row: Dict[int, int] = {}
+        bounds_arr = array("d")
+        has_bounds = bytearray()
+        style_rows: List[Optional[ComputedStyles]] = []
         
         for doc in snapshot.documents:
             nodes = doc.get("nodes", {})
@@ -173,35 +247,44 @@ class DOMExtractor:
             node_indices = layout.get("nodeIndex", [])
             bounds_list = layout.get("bounds", [])
             styles_list = layout.get("styles", [])
+            n_bounds = len(bounds_list)
+            n_styles = len(styles_list)
+            backend_ids = nodes.get("backendNodeId") or []
+            n_backend = len(backend_ids)
             
             for i, node_idx in enumerate(node_indices):
-                backend_node_id = nodes.get("backendNodeId", [])[node_idx] if node_idx < len(nodes.get("backendNodeId", [])) else None
+                backend_node_id = backend_ids[node_idx] if node_idx < n_backend else None
                 
                 if backend_node_id is None:
                     continue
                 
-                entry = {"backend_node_id": backend_node_id}
-                
                 # Add bounds
-                if i < len(bounds_list):
-                    b = bounds_list[i]
-                    if len(b) >= 4:
-                        entry["bounds"] = DOMRect(x=b[0], y=b[1], width=b[2], height=b[3])
+                b = bounds_list[i] if i < n_bounds else ()
+                if len(b) >= 4:
+                    bounds_arr.extend(b[:4])
+                    has_bounds.append(1)
+                else:
+                    bounds_arr.extend((0.0, 0.0, 0.0, 0.0))
+                    has_bounds.append(0)
                 
                 # Add styles
-                if i < len(styles_list):
+                computed = None
+                if i < n_styles:
                     style_indices = styles_list[i]
-                    styles = {}
-                    style_names = ["display", "visibility", "opacity", "position", "overflow", "pointer-events"]
-                    for j, style_idx in enumerate(style_indices):
-                        if j < len(style_names) and style_idx >= 0:
-                            styles[style_names[j]] = snapshot.get_string(style_idx)
-                    if styles:
-                        entry["styles"] = ComputedStyles(**styles)
+                    if any(idx >= 0 for idx in style_indices):
+                        computed = ComputedStyles(**{
+                            name: snapshot.get_string(idx)
+                            for name, idx in zip(_STYLE_FIELDS, style_indices)
+                            if idx >= 0
+                        })
+                style_rows.append(computed)
                 
-                lookup[backend_node_id] = entry
+                bid_to_row[backend_node_id] = len(style_rows) - 1
         
-        return lookup
+        self._bid_to_row = bid_to_row
+        self._bounds_arr = bounds_arr
+        self._has_bounds = has_bounds
+        self._style_rows = style_rows
     
     def _build_ax_lookup(
         self,
@@ -215,33 +298,110 @@ class DOMExtractor:
             if backend_node_id is None:
                 continue
             
-            entry = {
-                "role": node.get("role", {}).get("value"),
-                "name": node.get("name", {}).get("value"),
-                "description": node.get("description", {}).get("value"),
-                "properties": {},
+            role = node.get("role", {}).get("value")
+            name = node.get("name", {}).get("value")
+            description = node.get("description", {}).get("value")
+            properties = {
+                prop["name"]: prop["value"]["value"]
+                for prop in node.get("properties", ())
+                if prop.get("name")
+                and prop.get("value", {}).get("value") is not None
             }
             
-            # Extract properties
-            for prop in node.get("properties", []):
-                prop_name = prop.get("name")
-                prop_value = prop.get("value", {}).get("value")
-                if prop_name and prop_value is not None:
-                    entry["properties"][prop_name] = prop_value
+            # Most AX nodes carry no data; leave them out of the lookup
+            if role is None and name is None and description is None and not properties:
+                continue
+            
+            entry = {
+                "role": role,
+                "name": name,
+                "description": description,
+                "properties": properties,
+            }
             
             lookup[backend_node_id] = entry
         
         return lookup
     
-    async def _process_node(
+    def _process_tree(
+        self,
+        root: Dict[str, Any],
+        ax_lookup: Dict[int, Dict[str, Any]],
+    ) -> None:
+        """
+        Process the DOM tree iteratively.
+        
+        Nodes are created in document pre-order (children, then content
+        document, then shadow roots) using an explicit stack, so deep
+        trees never hit the recursion limit. Element text is aggregated
+        afterwards in reverse order, once every child is complete.
+        """
+        # Stack entries: (raw node, parent DOMNode, depth, link to parent)
+        stack: List[Tuple[Dict[str, Any], Optional[DOMNode], int, str]] = [
+            (root, None, 0, "child")
+        ]
+        order: List[DOMNode] = []
+        
+        while stack:
+            node, parent, depth, link = stack.pop()
+            dom_node = self._process_node(
+                node,
+                ax_lookup,
+                parent_id=parent.node_id if parent else None,
+                depth=depth,
+            )
+            if dom_node is None:
+                continue
+            order.append(dom_node)
+            
+            # Link into parent
+            if parent is not None:
+                if link == "child":
+                    parent.children_ids.append(dom_node.node_id)
+                elif link == "content":
+                    parent.content_document_id = dom_node.node_id
+                else:
+                    parent.shadow_root_id = dom_node.node_id
+                    parent.shadow_root_type = node.get("shadowRootType")
+            
+            # Push in reverse so children pop first, in document order
+            for shadow_root in reversed(node.get("shadowRoots", [])):
+                stack.append((shadow_root, dom_node, depth + 1, "shadow"))
+            content_doc = node.get("contentDocument")
+            if content_doc:
+                stack.append((content_doc, dom_node, depth + 1, "content"))
+            for child in reversed(node.get("children", [])):
+                stack.append((child, dom_node, depth + 1, "child"))
+        
+        # Aggregate text content from children, deepest nodes first.
+        # Element text is already stripped; text nodes are stripped here,
+        # and blank parts are dropped rather than joined.
+        nodes = self._nodes
+        for dom_node in reversed(order):
+            if dom_node.is_element:
+                text_parts = []
+                for child_id in dom_node.children_ids:
+                    child = nodes.get(child_id)
+                    if child is None:
+                        continue
+                    text = child.text_content
+                    if text and child.is_text:
+                        text = text.strip()
+                    if text:
+                        text_parts.append(text)
+                if len(text_parts) == 1:
+                    dom_node.text_content = text_parts[0]
+                else:
+                    dom_node.text_content = " ".join(text_parts)
+    
+    def _process_node(
         self,
         node: Dict[str, Any],
-        snapshot_lookup: Dict[int, Dict[str, Any]],
         ax_lookup: Dict[int, Dict[str, Any]],
         parent_id: Optional[int],
         depth: int,
     ) -> Optional[DOMNode]:
-        """Process a single DOM node and its children."""
+        """Create a DOMNode for a single raw node (children handled by caller)."""
         node_id = node.get("nodeId")
         backend_node_id = node.get("backendNodeId")
         node_type_value = node.get("nodeType", 1)
@@ -249,22 +409,49 @@ class DOMExtractor:
         if node_id is None or backend_node_id is None:
             return None
         
-        try:
-            node_type = NodeType(node_type_value)
-        except ValueError:
-            node_type = NodeType.ELEMENT_NODE
+        # Text nodes only carry their value; skip layout, AX and
+        # interactivity lookups entirely
+        if node_type_value == NodeType.TEXT_NODE:
+            node_value = node.get("nodeValue")
+            dom_node = DOMNode(
+                node_id=node_id,
+                backend_node_id=backend_node_id,
+                node_type=NodeType.TEXT_NODE,
+                tag_name="#text",
+                node_value=node_value,
+                text_content=node_value or "",
+                parent_id=parent_id,
+                depth=depth,
+            )
+            self._nodes[node_id] = dom_node
+            return dom_node
+        
+        node_type = _NODE_TYPE_BY_VALUE.get(node_type_value, NodeType.ELEMENT_NODE)
         
         # Get attributes
-        attributes = {}
-        attrs_list = node.get("attributes", [])
-        for i in range(0, len(attrs_list), 2):
-            if i + 1 < len(attrs_list):
-                attributes[attrs_list[i]] = attrs_list[i + 1]
+        # Tag names and attribute keys repeat across thousands of nodes;
+        # intern them so equal strings share one object
+        attrs = iter(node.get("attributes", ()))
+        attributes = {sys.intern(key): value for key, value in zip(attrs, attrs)}
         
         # Get snapshot data
-        snapshot_data = snapshot_lookup.get(backend_node_id, {})
-        bounds = snapshot_data.get("bounds")
-        styles = snapshot_data.get("styles")
+        bounds = None
+        styles = None
+        is_visible = True
+        row = self._bid_to_row.get(backend_node_id)
+        if row is not None:
+            styles = self._style_rows[row]
+            if self._has_bounds[row]:
+                arr = self._bounds_arr
+                base = row * 4
+                width = arr[base + 2]
+                height = arr[base + 3]
+                if width <= 0 or height <= 0:
+                    is_visible = False
+                bounds = DOMRect(
+                    x=arr[base], y=arr[base + 1], width=width, height=height
+                )
+                self._node_bounds.extend(arr[base:base + 4])
         
         # Get accessibility data
         ax_data = ax_lookup.get(backend_node_id, {})
@@ -276,18 +463,15 @@ class DOMExtractor:
         ) if ax_data else None
         
         # Determine visibility
-        is_visible = True
         if styles and not styles.is_visible:
             is_visible = False
-        if bounds and (bounds.width <= 0 or bounds.height <= 0):
-            is_visible = False
         
         # Create DOM node
         dom_node = DOMNode(
             node_id=node_id,
             backend_node_id=backend_node_id,
             node_type=node_type,
-            tag_name=node.get("nodeName", "").lower(),
+            tag_name=sys.intern(node.get("nodeName", "").lower()),
             node_value=node.get("nodeValue"),
             attributes=attributes,
             bounds=bounds,
@@ -308,11 +492,13 @@ class DOMExtractor:
             # Assign interaction index
             dom_node.index = self._interactive_index
             self._selector_map[self._interactive_index] = dom_node.to_selector_info()
+            self._index_to_node[self._interactive_index] = dom_node
+            self._interactive_nodes.append(dom_node)
             self._interactive_index += 1
             dom_node.is_clickable = True
         
         # Check if editable
-        tag = dom_node.tag_name.lower()
+        tag = dom_node.tag_name
         if tag in ("input", "textarea") or attributes.get("contenteditable") == "true":
             dom_node.is_editable = True
         
@@ -322,61 +508,23 @@ class DOMExtractor:
         
         # Store node
         self._nodes[node_id] = dom_node
-        
-        # Process children
-        children_ids = []
-        for child in node.get("children", []):
-            child_node = await self._process_node(
-                child,
-                snapshot_lookup,
-                ax_lookup,
-                parent_id=node_id,
-                depth=depth + 1,
-            )
-            if child_node:
-                children_ids.append(child_node.node_id)
-        
-        dom_node.children_ids = children_ids
-        
-        # Process content document (for iframes)
-        content_doc = node.get("contentDocument")
-        if content_doc:
-            doc_node = await self._process_node(
-                content_doc,
-                snapshot_lookup,
-                ax_lookup,
-                parent_id=node_id,
-                depth=depth + 1,
-            )
-            if doc_node:
-                dom_node.content_document_id = doc_node.node_id
-        
-        # Process shadow roots
-        for shadow_root in node.get("shadowRoots", []):
-            shadow_node = await self._process_node(
-                shadow_root,
-                snapshot_lookup,
-                ax_lookup,
-                parent_id=node_id,
-                depth=depth + 1,
-            )
-            if shadow_node:
-                dom_node.shadow_root_id = shadow_node.node_id
-                dom_node.shadow_root_type = shadow_root.get("shadowRootType")
-        
-        # Aggregate text content from children
-        if dom_node.is_element:
-            text_parts = []
-            for child_id in children_ids:
-                child = self._nodes.get(child_id)
-                if child and child.is_text:
-                    text_parts.append(child.text_content)
-                elif child and child.text_content:
-                    text_parts.append(child.text_content)
-            dom_node.text_content = " ".join(text_parts).strip()
+        if bounds is not None:
+            self._bounded_nodes.append(dom_node)
         
         return dom_node
     
+    def _build_node_columns(self) -> NodeColumns:
+        """Build statistics columns for all extracted nodes."""
+        columns = NodeColumns()
+        for node in self._nodes.values():
+            bounds = node.bounds
+            columns.append(
+                node.tag_name,
+                node.flags,
+                bounds.y + bounds.height if bounds else None,
+            )
+        return columns
+    
     def _node_to_dict(self, node: DOMNode) -> Dict[str, Any]:
         """Convert a DOMNode to a dictionary."""
         return {
@@ -404,28 +552,24 @@ class DOMExtractor:
     
     def get_node_by_index(self, index: int) -> Optional[DOMNode]:
         """Get a DOM node by its interaction index."""
-        for node in self._nodes.values():
-            if node.index == index:
-                return node
-        return None
+        return self._index_to_node.get(index)
     
     def get_visible_elements(self) -> List[DOMNode]:
         """Get all visible interactive elements."""
-        return [
-            node for node in self._nodes.values()
-            if node.is_visible and node.index is not None
-        ]
+        return [node for node in self._interactive_nodes if node.is_visible]
     
     def get_elements_in_viewport(self) -> List[DOMNode]:
         """Get elements within the current viewport."""
-        viewport = DOMRect(
-            x=0, y=0,
-            width=self.viewport_width,
-            height=self.viewport_height
+        nodes = self._bounded_nodes
+        if not nodes:
+            return []
+        
+        # Bounds are packed as x, y, width, height per node
+        b = self._node_bounds
+        if np is not None:
+            b = np.frombuffer(b, dtype=np.float64)
+        mask = DOMRect.intersects_viewport(
+            b[0::4], b[1::4], b[2::4], b[3::4],
+            0, 0, self.viewport_width, self.viewport_height,
         )
-        
-        return [
-            node for node in self._nodes.values()
-            if node.bounds and viewport.intersects(node.bounds)
-        ]
-
+        return [node for node, hit in zip(nodes, mask) if hit]
@@ -1,10 +1,18 @@
 """DOM serialization for LLM consumption."""
 
 import logging
+import sys
 from typing import Any, Dict, List, Optional
+from softlight_automation_framework.dom._jit import (
+    HAS_JIT,
+    JIT_THRESHOLD,
+    sort_visible_rows,
+)
 from softlight_automation_framework.dom.views import (
+    DEFAULT_INCLUDE_ATTRIBUTES,
     DOMNode,
     DOMState,
+    InteractiveElementsSoA,
     SerializedDOM,
     NodeType,
 )
@@ -36,10 +44,10 @@ class DOMSerializer:
         """
         self.dom_state = dom_state
         self.max_length = max_length
-        self.include_attributes = include_attributes or [
-            "aria-label", "placeholder", "type", "role",
-            "href", "src", "alt", "title", "name", "value"
-        ]
+        self.include_attributes = (
+            tuple(map(sys.intern, include_attributes))
+            if include_attributes else DEFAULT_INCLUDE_ATTRIBUTES
+        )
         
         # Statistics
         self.stats = {
@@ -83,23 +91,29 @@ class DOMSerializer:
         else:
             lines.append("[Start of page]")
         
-        # Serialize interactive elements
-        elements = self._get_sorted_elements()
-        for element in elements:
-            line = self._serialize_element(element)
-            if line:
-                lines.append(line)
+        # Serialize interactive elements. Stop once past max_length: the
+        # joined text is cut there anyway, so later lines would be dropped.
+        max_length = self.max_length
+        total = len(lines[0])
+        truncated = False
+        columns = self.dom_state.get_interactive_columns(self.include_attributes)
+        for row in self._get_sorted_elements(columns):
+            line = self._serialize_element(columns, row)
+            lines.append(line)
+            total += len(line) + 1
+            if total > max_length:
+                truncated = True
+                break
         
         # Add end marker
-        if not has_content_below:
+        if not has_content_below and not truncated:
             lines.append("[End of page]")
         
         # Join and truncate if needed
         representation = "\n".join(lines)
-        truncated = False
         
-        if len(representation) > self.max_length:
-            representation = representation[:self.max_length]
+        if len(representation) > max_length:
+            representation = representation[:max_length]
             truncated = True
             logger.debug(f"DOM representation truncated to {self.max_length} chars")
         
@@ -120,116 +134,39 @@ class DOMSerializer:
     
     def _calculate_stats(self) -> None:
         """Calculate DOM statistics."""
-        for node_data in self.dom_state.nodes.values():
-            self.stats["total_elements"] += 1
-            
-            tag = node_data.get("tag_name", "").lower()
-            is_visible = node_data.get("is_visible", False)
-            index = node_data.get("index")
-            
-            if is_visible:
-                self.stats["visible_elements"] += 1
-            
-            if index is not None:
-                self.stats["interactive_elements"] += 1
-            
-            if tag == "a":
-                self.stats["links_count"] += 1
-            elif tag in ("iframe", "frame"):
-                self.stats["iframes_count"] += 1
+        self.stats.update(self.dom_state.get_node_columns().get_stats())
     
     def _get_page_height(self) -> float:
         """Estimate page height from element positions."""
-        max_y = self.dom_state.viewport_height
-        
-        for node_data in self.dom_state.nodes.values():
-            bounds = node_data.get("bounds")
-            if bounds:
-                bottom = bounds.get("y", 0) + bounds.get("height", 0)
-                max_y = max(max_y, bottom)
-        
-        return max_y
+        return self.dom_state.get_page_height()
     
-    def _get_sorted_elements(self) -> List[Dict[str, Any]]:
-        """Get interactive elements sorted by position."""
-        elements = []
-        
-        for node_data in self.dom_state.interactive_elements.values():
-            if node_data.get("is_visible", True):
-                elements.append(node_data)
-        
-        # Sort by Y position, then X position
-        def sort_key(e):
-            bounds = e.get("bounds", {})
-            return (bounds.get("y", 0), bounds.get("x", 0))
-        
-        return sorted(elements, key=sort_key)
+    def _get_sorted_elements(self, columns: InteractiveElementsSoA) -> List[int]:
+        """Get rows of visible interactive elements sorted by position."""
+        if HAS_JIT and len(columns) > JIT_THRESHOLD:
+            return sort_visible_rows(columns.ys, columns.xs, columns.flags)
+        return columns.sorted_rows()
     
-    def _serialize_element(self, element: Dict[str, Any]) -> str:
+    def _serialize_element(self, columns: InteractiveElementsSoA, row: int) -> str:
         """
-        Serialize a single element to string format.
+        Serialize a single element row to string format.
         
         Format: [index]<tag attributes>text</tag>
         """
-        index = element.get("index")
-        if index is None:
-            return ""
-        
-        tag = element.get("tag_name", "div")
-        text = element.get("text", "")
-        attrs = element.get("attributes", {})
-        depth = element.get("depth", 0)
-        
-        # Build attribute string
-        attr_parts = []
-        for attr_name in self.include_attributes:
-            if attr_name in attrs:
-                value = attrs[attr_name]
-                if value:
-                    # Truncate long values
-                    if len(value) > 50:
-                        value = value[:47] + "..."
-                    attr_parts.append(f"{attr_name}='{value}'")
-        
-        # Add accessibility info
-        ax = element.get("accessibility", {})
-        if ax:
-            if ax.get("role") and "role" not in attrs:
-                attr_parts.append(f"role='{ax['role']}'")
-            if ax.get("name") and "aria-label" not in attrs:
-                attr_parts.append(f"aria-label='{ax['name'][:50]}'")
-        
-        attr_str = " " + " ".join(attr_parts) if attr_parts else ""
-        
-        # Truncate text
-        if len(text) > 100:
-            text = text[:97] + "..."
-        
-        # Build the line with indentation
-        indent = "\t" * min(depth, 5)  # Cap indentation depth
-        
-        # Check if element is new (appeared since last state)
-        is_new = element.get("is_new", False)
-        prefix = "*" if is_new else ""
-        
-        return f"{indent}{prefix}[{index}]<{tag}{attr_str}>{text}</{tag}>"
+        return columns.render_line(row)
     
     def get_statistics_header(self) -> str:
         """Get formatted statistics header for LLM."""
-        parts = []
-        parts.append(f"<page_stats>")
-        parts.append(f"{self.stats['links_count']} links")
-        parts.append(f"{self.stats['interactive_elements']} interactive")
+        s = self.stats
+        parts = [f"{s['links_count']} links", f"{s['interactive_elements']} interactive"]
         
-        if self.stats["iframes_count"] > 0:
-            parts.append(f"{self.stats['iframes_count']} iframes")
-        if self.stats["scroll_containers"] > 0:
-            parts.append(f"{self.stats['scroll_containers']} scroll containers")
+        if s["iframes_count"] > 0:
+            parts.append(f"{s['iframes_count']} iframes")
+        if s["scroll_containers"] > 0:
+            parts.append(f"{s['scroll_containers']} scroll containers")
         
-        parts.append(f"{self.stats['total_elements']} total elements")
-        parts.append("</page_stats>")
+        parts.append(f"{s['total_elements']} total elements")
         
-        return ", ".join(parts[1:-1])
+        return ", ".join(parts)
 
 
 def serialize_dom_for_llm(
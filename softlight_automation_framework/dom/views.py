@@ -1,9 +1,42 @@
 """Data models for DOM extraction and representation."""
 
+import sys
+from array import array
+from collections import Counter
+from functools import cached_property
 from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Interactivity lookups, interned so equality checks hit the identity fast path
+_INTERACTIVE_TAGS = frozenset(map(sys.intern, (
+    "a", "button", "input", "select", "textarea",
+    "label", "details", "summary", "dialog",
+)))
+_INTERACTIVE_ATTR_ROLES = frozenset(map(sys.intern, (
+    "button", "link", "menuitem", "option", "tab",
+    "checkbox", "radio", "textbox", "combobox",
+)))
+_INTERACTIVE_AX_ROLES = _INTERACTIVE_ATTR_ROLES | frozenset(map(sys.intern, (
+    "listbox", "slider", "spinbutton", "searchbox",
+    "switch", "gridcell", "treeitem",
+)))
+
+
+# Truncation limits (including the "..." suffix)
+_TRUNC_ATTR_VAL = 50
+_TRUNC_TEXT = 100
+
+
+def _trunc(s: str, n: int) -> str:
+    """Truncate to at most ``n`` characters, ending with "..." if cut."""
+    return s if len(s) <= n else s[:n - 3] + "..."
 
 
 class NodeType(IntEnum):
@@ -18,25 +51,30 @@ class NodeType(IntEnum):
     DOCUMENT_FRAGMENT_NODE = 11
 
 
-@dataclass
+@dataclass(frozen=True)
 class DOMRect:
-    """Bounding rectangle for a DOM element."""
+    """Bounding rectangle for a DOM element (immutable; derived values cached)."""
     x: float
     y: float
     width: float
     height: float
     
-    @property
+    @cached_property
     def center_x(self) -> float:
         """Get center X coordinate."""
         return self.x + self.width / 2
     
-    @property
+    @cached_property
     def center_y(self) -> float:
         """Get center Y coordinate."""
         return self.y + self.height / 2
     
-    @property
+    @cached_property
+    def bottom(self) -> float:
+        """Get bottom edge Y coordinate."""
+        return self.y + self.height
+    
+    @cached_property
     def area(self) -> float:
         """Get rectangle area."""
         return self.width * self.height
@@ -50,6 +88,48 @@ class DOMRect:
             self.y + self.height > other.y
         )
     
+    @staticmethod
+    def intersects_viewport(
+        xs: Sequence[float],
+        ys: Sequence[float],
+        ws: Sequence[float],
+        hs: Sequence[float],
+        vx: float,
+        vy: float,
+        vw: float,
+        vh: float,
+    ) -> Sequence[bool]:
+        """
+        Bulk ``intersects`` test of many rects against one viewport rect.
+        
+        Args:
+            xs: X positions, one per rect
+            ys: Y positions, one per rect
+            ws: Widths, one per rect
+            hs: Heights, one per rect
+            vx: Viewport X
+            vy: Viewport Y
+            vw: Viewport width
+            vh: Viewport height
+        
+        Returns:
+            Boolean mask, one entry per rect (``np.ndarray`` when NumPy
+            is installed, otherwise a list)
+        """
+        right = vx + vw
+        bottom = vy + vh
+        if np is not None:
+            xs = np.asarray(xs, dtype=np.float64)
+            ys = np.asarray(ys, dtype=np.float64)
+            return (
+                (xs < right) & (xs + np.asarray(ws, dtype=np.float64) > vx) &
+                (ys < bottom) & (ys + np.asarray(hs, dtype=np.float64) > vy)
+            )
+        return [
+            x < right and x + w > vx and y < bottom and y + h > vy
+            for x, y, w, h in zip(xs, ys, ws, hs)
+        ]
+    
     def contains_point(self, x: float, y: float) -> bool:
         """Check if point is inside rectangle."""
         return (
@@ -99,13 +179,7 @@ class AccessibilityInfo:
     @property
     def is_interactive_role(self) -> bool:
         """Check if element has an interactive ARIA role."""
-        interactive_roles = {
-            "button", "link", "menuitem", "option", "tab",
-            "checkbox", "radio", "textbox", "combobox",
-            "listbox", "slider", "spinbutton", "searchbox",
-            "switch", "gridcell", "treeitem"
-        }
-        return self.role in interactive_roles if self.role else False
+        return self.role in _INTERACTIVE_AX_ROLES if self.role else False
 
 
 @dataclass
@@ -174,28 +248,38 @@ class DOMNode:
             return False
         
         # Check tag name
-        interactive_tags = {
-            "a", "button", "input", "select", "textarea",
-            "label", "details", "summary", "dialog"
-        }
-        if self.tag_name.lower() in interactive_tags:
+        if self.tag_name.lower() in _INTERACTIVE_TAGS:
             return True
         
         # Check attributes
-        if self.attributes.get("onclick"):
+        attributes = self.attributes
+        if attributes.get("onclick"):
             return True
-        if self.attributes.get("tabindex"):
+        if attributes.get("tabindex"):
             return True
-        if self.attributes.get("contenteditable") == "true":
+        if attributes.get("contenteditable") == "true":
             return True
-        if self.attributes.get("role") in {
-            "button", "link", "menuitem", "option", "tab",
-            "checkbox", "radio", "textbox", "combobox"
-        }:
+        if attributes.get("role") in _INTERACTIVE_ATTR_ROLES:
             return True
         
         return False
     
+    @property
+    def flags(self) -> int:
+        """Get node state as a FLAG_* bitmask."""
+        flags = 0
+        if self.index is not None:
+            flags |= FLAG_INTERACTIVE
+        if self.is_visible:
+            flags |= FLAG_VISIBLE
+        if self.is_clickable:
+            flags |= FLAG_CLICKABLE
+        if self.is_editable:
+            flags |= FLAG_EDITABLE
+        if self.is_scrollable:
+            flags |= FLAG_SCROLLABLE
+        return flags
+    
     def get_attribute(self, name: str, default: str = "") -> str:
         """Safely get an attribute value."""
         return self.attributes.get(name, default)
@@ -204,12 +288,9 @@ class DOMNode:
         """Check if attribute exists."""
         return name in self.attributes
     
-    def get_text(self, max_length: int = 100) -> str:
+    def get_text(self, max_length: int = _TRUNC_TEXT) -> str:
         """Get truncated text content."""
-        text = self.text_content.strip()
-        if len(text) > max_length:
-            return text[:max_length - 3] + "..."
-        return text
+        return _trunc(self.text_content.strip(), max_length)
     
     def to_selector_info(self) -> Dict[str, Any]:
         """Convert to selector info for element interaction."""
@@ -226,20 +307,237 @@ class DOMNode:
         }
 
 
-class DOMState(BaseModel):
+# Attributes shown to the LLM for each interactive element, in output order
+DEFAULT_INCLUDE_ATTRIBUTES: Tuple[str, ...] = (
+    "aria-label", "placeholder", "type", "role",
+    "href", "src", "alt", "title", "name", "value",
+)
+
+# Indentation strings for each (capped) depth
+_INDENTS = tuple("\t" * depth for depth in range(6))
+
+# Per-node state bits stored in column layouts
+FLAG_INTERACTIVE = 1  # has an interaction index
+FLAG_VISIBLE = 2
+FLAG_CLICKABLE = 4
+FLAG_EDITABLE = 8
+FLAG_SCROLLABLE = 16
+
+
+def _flags_from_dict(data: Dict[str, Any], visible_default: bool) -> int:
+    """Pack the boolean state of a node/element dict into flag bits."""
+    flags = 0
+    if data.get("index") is not None:
+        flags |= FLAG_INTERACTIVE
+    if data.get("is_visible", visible_default):
+        flags |= FLAG_VISIBLE
+    if data.get("is_clickable"):
+        flags |= FLAG_CLICKABLE
+    if data.get("is_editable"):
+        flags |= FLAG_EDITABLE
+    if data.get("is_scrollable"):
+        flags |= FLAG_SCROLLABLE
+    return flags
+
+
+@dataclass
+class InteractiveElementsSoA:
+    """
+    Interactive elements stored column-wise for serialization.
+    
+    Each element dict is read once into parallel columns; serializing
+    then indexes rows instead of probing dicts. Text is pre-truncated,
+    depth pre-capped and the attribute string pre-rendered for
+    ``attr_names``.
+    """
+    
+    attr_names: Tuple[str, ...] = DEFAULT_INCLUDE_ATTRIBUTES
+    indices: List[int] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    attr_strs: List[str] = field(default_factory=list)
+    depths: array = field(default_factory=lambda: array("B"))
+    is_new: array = field(default_factory=lambda: array("B"))
+    flags: array = field(default_factory=lambda: array("B"))
+    ys: array = field(default_factory=lambda: array("d"))
+    xs: array = field(default_factory=lambda: array("d"))
+    
+    def __post_init__(self):
+        self._include_set = frozenset(self.attr_names)
+        self._include_order = {name: i for i, name in enumerate(self.attr_names)}
+    
+    @classmethod
+    def from_elements(
+        cls,
+        elements: Iterable[Dict[str, Any]],
+        attr_names: Tuple[str, ...] = DEFAULT_INCLUDE_ATTRIBUTES,
+    ) -> "InteractiveElementsSoA":
+        """Build columns from interactive element dicts."""
+        columns = cls(attr_names=attr_names)
+        for element in elements:
+            columns.append(element)
+        return columns
+    
+    def __len__(self) -> int:
+        return len(self.indices)
+    
+    def append(self, element: Dict[str, Any]) -> None:
+        """Add an element dict as a new row (skipped if it has no index)."""
+        index = element.get("index")
+        if index is None:
+            return
+        
+        attrs = element.get("attributes", {})
+        bounds = element.get("bounds") or {}
+        
+        text = _trunc(element.get("text", ""), _TRUNC_TEXT)
+        
+        self.indices.append(index)
+        self.tags.append(element.get("tag_name", "div"))
+        self.texts.append(text)
+        self.attr_strs.append(
+            self.render_attributes(attrs, element.get("accessibility"))
+        )
+        self.depths.append(min(element.get("depth", 0), 5))
+        self.is_new.append(1 if element.get("is_new", False) else 0)
+        self.flags.append(_flags_from_dict(element, True))
+        self.ys.append(bounds.get("y", 0))
+        self.xs.append(bounds.get("x", 0))
+    
+    def render_attributes(
+        self,
+        attrs: Dict[str, str],
+        accessibility: Optional[Dict[str, Any]],
+    ) -> str:
+        """Render the attribute string (with leading space) for an element."""
+        # Walk whichever side is smaller; output stays in attr_names order
+        if len(attrs) < len(self.attr_names):
+            include = self._include_set
+            matched = [name for name in attrs if name in include]
+            if len(matched) > 1:
+                matched.sort(key=self._include_order.__getitem__)
+        else:
+            matched = self.attr_names
+        
+        trunc = _trunc
+        attr_parts = []
+        for attr_name in matched:
+            value = attrs.get(attr_name)
+            if value:
+                attr_parts.append(f"{attr_name}='{trunc(value, _TRUNC_ATTR_VAL)}'")
+        
+        # Add accessibility info
+        if accessibility:
+            if accessibility.get("role") and "role" not in attrs:
+                attr_parts.append(f"role='{accessibility['role']}'")
+            if accessibility.get("name") and "aria-label" not in attrs:
+                attr_parts.append(f"aria-label='{accessibility['name'][:50]}'")
+        
+        return " " + " ".join(attr_parts) if attr_parts else ""
+    
+    def sorted_rows(self) -> List[int]:
+        """Get rows of visible elements sorted by Y position, then X."""
+        ys = self.ys
+        xs = self.xs
+        flags = self.flags
+        rows = [row for row in range(len(self.indices)) if flags[row] & FLAG_VISIBLE]
+        rows.sort(key=lambda row: (ys[row], xs[row]))
+        return rows
+    
+    def render_line(self, row: int) -> str:
+        """
+        Serialize a single row.
+        
+        Format: [index]<tag attributes>text</tag>
+        """
+        tag = self.tags[row]
+        return "".join((
+            _INDENTS[self.depths[row]],
+            "*" if self.is_new[row] else "",
+            "[", str(self.indices[row]), "]<",
+            tag, self.attr_strs[row], ">",
+            self.texts[row],
+            "</", tag, ">",
+        ))
+
+
+@dataclass
+class NodeColumns:
+    """
+    Per-node columns used for page statistics.
+    
+    Counts and the page height reduce over these with C-level builtins
+    (``Counter``, ``list.count``, ``max``) instead of a dict walk per node.
+    """
+    
+    tags: List[str] = field(default_factory=list)
+    flags: array = field(default_factory=lambda: array("B"))
+    # Bottom edge (y + height) of every node that has bounds
+    bottoms: array = field(default_factory=lambda: array("d"))
+    
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Dict[str, Any]]) -> "NodeColumns":
+        """Build columns from node dicts."""
+        columns = cls()
+        for node_data in nodes:
+            bounds = node_data.get("bounds")
+            columns.append(
+                node_data.get("tag_name", ""),
+                _flags_from_dict(node_data, False),
+                bounds.get("y", 0) + bounds.get("height", 0) if bounds else None,
+            )
+        return columns
+    
+    def append(
+        self,
+        tag_name: str,
+        flags: int,
+        bottom: Optional[float] = None,
+    ) -> None:
+        """Add a node as a new row (``flags`` is a FLAG_* bitmask)."""
+        self.tags.append(tag_name.lower())
+        self.flags.append(flags)
+        if bottom is not None:
+            self.bottoms.append(bottom)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get node counts keyed like the serializer statistics."""
+        tags = self.tags
+        # Histogram the few distinct flag values, then test bits per value
+        visible = interactive = 0
+        for flags, count in Counter(self.flags).items():
+            if flags & FLAG_VISIBLE:
+                visible += count
+            if flags & FLAG_INTERACTIVE:
+                interactive += count
+        return {
+            "total_elements": len(tags),
+            "visible_elements": visible,
+            "interactive_elements": interactive,
+            "links_count": tags.count("a"),
+            "iframes_count": tags.count("iframe") + tags.count("frame"),
+        }
+    
+    def get_max_bottom(self, default: float = 0.0) -> float:
+        """Get the lowest bottom edge, or ``default`` if it is larger."""
+        return max(default, max(self.bottoms, default=default))
+
+
+@dataclass(slots=True)
+class DOMState:
     """Complete DOM state representation."""
     
     # Root node
-    root_node_id: int = Field(description="Root node ID")
+    root_node_id: int
     
-    # All nodes indexed by node_id
-    nodes: Dict[int, Dict[str, Any]] = Field(default_factory=dict)
+    # All nodes indexed by node_id (may be a lazily converted mapping)
+    nodes: Mapping[int, Dict[str, Any]] = field(default_factory=dict)
     
     # Interactive elements with assigned indices
-    interactive_elements: Dict[int, Dict[str, Any]] = Field(default_factory=dict)
+    interactive_elements: Dict[int, Dict[str, Any]] = field(default_factory=dict)
     
     # Selector map for element interaction
-    selector_map: Dict[int, Dict[str, Any]] = Field(default_factory=dict)
+    selector_map: Dict[int, Dict[str, Any]] = field(default_factory=dict)
     
     # Page info
     url: str = ""
@@ -251,6 +549,95 @@ class DOMState(BaseModel):
     scroll_x: float = 0.0
     scroll_y: float = 0.0
     
+    # Column layout of nodes, if the producer already has one; otherwise
+    # built from nodes on first use
+    node_columns: Optional[NodeColumns] = field(
+        default=None, repr=False, compare=False
+    )
+    
+    # Column layouts of interactive_elements, keyed by attribute names
+    _columns: Dict[Tuple[str, ...], InteractiveElementsSoA] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # (viewport_height, page height) from the last get_page_height call
+    _page_height_cache: Optional[Tuple[int, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @classmethod
+    def validate(cls, data: Dict[str, Any]) -> "DOMState":
+        """
+        Create a DOMState from untrusted data, checking field types.
+        
+        Args:
+            data: Field values keyed by name
+            
+        Returns:
+            New DOMState
+            
+        Raises:
+            ValueError: If a field is unknown or has the wrong type
+        """
+        expected = {
+            "root_node_id": int,
+            "nodes": Mapping,
+            "interactive_elements": dict,
+            "selector_map": dict,
+            "url": str,
+            "title": str,
+            "viewport_width": int,
+            "viewport_height": int,
+            "scroll_x": (int, float),
+            "scroll_y": (int, float),
+            "node_columns": NodeColumns,
+        }
+        for name, value in data.items():
+            if name not in expected:
+                raise ValueError(f"Unknown DOMState field: {name}")
+            if not isinstance(value, expected[name]) or isinstance(value, bool):
+                raise ValueError(f"Invalid type for DOMState.{name}: {type(value).__name__}")
+        if "root_node_id" not in data:
+            raise ValueError("DOMState.root_node_id is required")
+        return cls(**data)
+    
+    def get_node_columns(self) -> NodeColumns:
+        """Get per-node columns for statistics, building them on first use."""
+        if self.node_columns is None:
+            self.node_columns = NodeColumns.from_nodes(self.nodes.values())
+        return self.node_columns
+    
+    def get_page_height(self) -> float:
+        """Estimate page height from element positions (cached)."""
+        cached = self._page_height_cache
+        if cached is None or cached[0] != self.viewport_height:
+            height = self.get_node_columns().get_max_bottom(self.viewport_height)
+            cached = self._page_height_cache = (self.viewport_height, height)
+        return cached[1]
+    
+    def invalidate_caches(self) -> None:
+        """Drop derived layouts; call after mutating nodes or elements."""
+        self._columns = {}
+        self.node_columns = None
+        self._page_height_cache = None
+    
+    def get_interactive_columns(
+        self,
+        attr_names: Tuple[str, ...] = DEFAULT_INCLUDE_ATTRIBUTES,
+    ) -> InteractiveElementsSoA:
+        """
+        Get interactive elements in column layout.
+        
+        Built on first use and reused by later serializations; element
+        dicts should not be mutated afterwards.
+        """
+        columns = self._columns.get(attr_names)
+        if columns is None:
+            columns = InteractiveElementsSoA.from_elements(
+                self.interactive_elements.values(), attr_names
+            )
+            self._columns[attr_names] = columns
+        return columns
+    
     def get_node(self, node_id: int) -> Optional[Dict[str, Any]]:
         """Get a node by ID."""
         return self.nodes.get(node_id)
@@ -326,11 +713,24 @@ class AccessibilityTree:
     """Accessibility tree from CDP."""
     
     nodes: List[Dict[str, Any]] = field(default_factory=list)
+    _by_backend: Optional[Dict[int, Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def get_node_by_backend_id(self, backend_node_id: int) -> Optional[Dict[str, Any]]:
         """Get AX node by backend DOM node ID."""
-        for node in self.nodes:
-            if node.get("backendDOMNodeId") == backend_node_id:
-                return node
-        return None
+        by_backend = self._by_backend
+        if by_backend is None:
+            # First node wins, matching the order of a linear scan
+            by_backend = {}
+            for node in self.nodes:
+                backend_id = node.get("backendDOMNodeId")
+                if backend_id is not None:
+                    by_backend.setdefault(backend_id, node)
+            self._by_backend = by_backend
+        return by_backend.get(backend_node_id)
+    
+    def invalidate(self) -> None:
+        """Drop the backend ID index; call after mutating ``nodes``."""
+        self._by_backend = None
 
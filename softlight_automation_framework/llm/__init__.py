@@ -1,6 +1,7 @@
 """LLM integration module for GPT-based decision making."""
 
 from softlight_automation_framework.llm.openai_client import OpenAIClient
+from softlight_automation_framework.llm.cache import SemanticCache
 from softlight_automation_framework.llm.messages import (
     Message,
     SystemMessage,
@@ -16,6 +17,7 @@ from softlight_automation_framework.llm.schema import (
 
 __all__ = [
     "OpenAIClient",
+    "SemanticCache",
     "Message",
     "SystemMessage",
     "UserMessage",
@@ -0,0 +1,190 @@
+"""Response caches for LLM completions."""
+
+import asyncio
+import importlib.util
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from softlight_automation_framework.llm.schema import LLMResponse
+
+# Checked without importing: sentence-transformers pulls in torch, so it is
+# only loaded on the first embedding
+_HAS_EMBEDDINGS = (
+    importlib.util.find_spec("numpy") is not None
+    and importlib.util.find_spec("sentence_transformers") is not None
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    """A cached embedding with its response and hit count."""
+    
+    __slots__ = ("key", "scope", "embedding", "response", "hits")
+    
+    def __init__(self, key: int, scope: Hashable, embedding: Any, response: LLMResponse):
+        self.key = key
+        self.scope = scope
+        self.embedding = embedding
+        self.response = response
+        self.hits = 0
+
+
+class SemanticCache:
+    """
+    Prompt-response cache keyed by sentence-embedding similarity.
+    
+    New entries land in a short-term tier with LRU eviction. Every
+    ``promote_every`` inserts, entries hit at least ``promote_hits``
+    times move to a long-term tier that evicts its least frequently
+    used entry when full.
+    
+    Similarity is only compared between entries of the same ``scope``
+    (e.g. model and response format), which must match exactly.
+    
+    Needs ``sentence-transformers`` (and NumPy); without them the cache
+    is disabled and every lookup misses.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.87,
+        model_name: str = "all-MiniLM-L6-v2",
+        short_term_size: int = 256,
+        long_term_size: int = 64,
+        promote_hits: int = 2,
+        promote_every: int = 32,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            model_name: sentence-transformers model used for embeddings
+            short_term_size: Maximum entries in the LRU tier
+            long_term_size: Maximum entries in the LFU tier
+            promote_hits: Hits needed to move an entry to the LFU tier
+            promote_every: Inserts between promotion passes
+        """
+        self.threshold = threshold
+        self.model_name = model_name
+        self.short_term_size = short_term_size
+        self.long_term_size = long_term_size
+        self.promote_hits = promote_hits
+        self.promote_every = promote_every
+        
+        self._model = None
+        self._short_term: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._long_term: List[_CacheEntry] = []
+        self._next_id = 0
+        self._inserts = 0
+        # Stacked embeddings and their entries per scope; rebuilt after any change
+        self._matrices: Dict[Hashable, Tuple[Any, List[_CacheEntry]]] = {}
+        
+        self.enabled = _HAS_EMBEDDINGS
+        if not self.enabled:
+            logger.warning(
+                "sentence-transformers not installed; semantic cache disabled"
+            )
+    
+    def __len__(self) -> int:
+        return len(self._short_term) + len(self._long_term)
+    
+    def _embed(self, text: str) -> Any:
+        """Embed text as an L2-normalized vector."""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True)
+    
+    async def embed(self, text: str) -> Any:
+        """
+        Embed text off the event loop.
+        
+        Args:
+            text: Prompt text that varies between requests
+        
+        Returns:
+            Normalized embedding vector
+        """
+        return await asyncio.to_thread(self._embed, text)
+    
+    def lookup(self, embedding: Any, scope: Hashable) -> Optional[LLMResponse]:
+        """
+        Find the cached response most similar to an embedding.
+        
+        Args:
+            embedding: Normalized prompt embedding
+            scope: Exact-match key the entry must share
+        
+        Returns:
+            Copy of the cached LLMResponse, or None below the similarity
+            threshold
+        """
+        if not self.enabled or not len(self):
+            return None
+        
+        matrix = self._matrices.get(scope)
+        if matrix is None:
+            entries = [
+                e for e in list(self._short_term.values()) + self._long_term
+                if e.scope == scope
+            ]
+            if not entries:
+                return None
+            import numpy as np
+            matrix = self._matrices[scope] = (
+                np.stack([e.embedding for e in entries]), entries
+            )
+        
+        embeddings, entries = matrix
+        sims = embeddings @ embedding
+        best = int(sims.argmax())
+        if sims[best] < self.threshold:
+            return None
+        
+        entry = entries[best]
+        entry.hits += 1
+        if entry.key in self._short_term:
+            self._short_term.move_to_end(entry.key)
+        return entry.response.model_copy(update={"latency_ms": 0}, deep=True)
+    
+    def insert(self, embedding: Any, scope: Hashable, response: LLMResponse) -> None:
+        """
+        Cache a response under its prompt embedding.
+        
+        Args:
+            embedding: Normalized prompt embedding
+            scope: Exact-match key for later lookups
+            response: Response to return on later hits
+        """
+        if not self.enabled:
+            return
+        
+        self._short_term[self._next_id] = _CacheEntry(
+            self._next_id, scope, embedding, response
+        )
+        self._next_id += 1
+        if len(self._short_term) > self.short_term_size:
+            self._short_term.popitem(last=False)
+        
+        self._inserts += 1
+        if self._inserts % self.promote_every == 0:
+            self._promote()
+        self._matrices.clear()
+    
+    def _promote(self) -> None:
+        """Move frequently hit entries from the LRU tier to the LFU tier."""
+        for key in [k for k, e in self._short_term.items() if e.hits >= self.promote_hits]:
+            self._long_term.append(self._short_term.pop(key))
+        
+        if len(self._long_term) > self.long_term_size:
+            self._long_term.sort(key=lambda e: e.hits, reverse=True)
+            del self._long_term[self.long_term_size:]
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._short_term.clear()
+        self._long_term.clear()
+        self._matrices.clear()
@@ -1,17 +1,97 @@
 """Message types for LLM communication."""
 
+import itertools
+import json
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Deque, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_json(obj: Any) -> bytes:
+    """Encode to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 
-@dataclass
 class ImageContent:
-    """Image content for vision models."""
+    """
+    Image content for vision models.
+    
+    Instances are immutable, since ``from_base64`` may share one instance
+    between messages: every attribute is a read-only property, and only
+    the derived data URL is filled in lazily.
+    """
+    
+    __slots__ = ("_url", "_media_type", "_detail", "_base64_data", "__weakref__")
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        media_type: str = "image/png",
+        detail: Literal["auto", "low", "high"] = "auto",
+        base64_data: Optional[str] = None,
+    ):
+        """
+        Initialize image content.
+        
+        Args:
+            url: HTTP or data URL (may be omitted when base64_data is given)
+            media_type: Image MIME type
+            detail: Vision detail level
+            base64_data: Raw base64 payload; the data URL is built on demand
+        """
+        if url is None and base64_data is None:
+            raise ValueError("ImageContent needs a url or base64_data")
+        self._url = url
+        self._media_type = media_type
+        self._detail = detail
+        self._base64_data = base64_data
+    
+    @property
+    def url(self) -> str:
+        """Get the image URL (can be base64 data URL or HTTP URL)."""
+        if self._url is None:
+            self._url = f"data:{self._media_type};base64,{self._base64_data}"
+        return self._url
+    
+    @property
+    def media_type(self) -> str:
+        """Get the image MIME type."""
+        return self._media_type
+    
+    @property
+    def detail(self) -> Literal["auto", "low", "high"]:
+        """Get the vision detail level."""
+        return self._detail
+    
+    @property
+    def base64_data(self) -> Optional[str]:
+        """Get the raw base64 payload, if the image was built from one."""
+        return self._base64_data
+    
+    def __repr__(self) -> str:
+        return f"ImageContent(media_type={self._media_type!r}, detail={self._detail!r})"
     
-    url: str  # Can be base64 data URL or HTTP URL
-    media_type: str = "image/png"
-    detail: Literal["auto", "low", "high"] = "auto"
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImageContent):
+            return NotImplemented
+        return (
+            self._media_type == other._media_type
+            and self._detail == other._detail
+            and self.url == other.url
+        )
+    
+    def __hash__(self) -> int:
+        # str caches its hash, so repeated hashing of a large URL is cheap
+        return hash((self._media_type, self._detail, self.url))
     
     @classmethod
     def from_base64(
@@ -20,9 +100,25 @@ class ImageContent:
         media_type: str = "image/png",
         detail: Literal["auto", "low", "high"] = "auto"
     ) -> "ImageContent":
-        """Create from base64 encoded image data."""
-        url = f"data:{media_type};base64,{base64_data}"
-        return cls(url=url, media_type=media_type, detail=detail)
+        """
+        Create from base64 encoded image data.
+        
+        Identical payloads (same data, media type and detail) that are
+        still alive share one instance, so the data URL exists once.
+        """
+        # Cheap fingerprint instead of hashing megabytes of screenshot;
+        # a hit is confirmed by comparing the payloads
+        key = (
+            media_type, detail, len(base64_data),
+            base64_data[:_FINGERPRINT_CHARS], base64_data[-_FINGERPRINT_CHARS:],
+        )
+        image = _images_by_fingerprint.get(key)
+        if image is None or (
+            image.base64_data is not base64_data and image.base64_data != base64_data
+        ):
+            image = cls(media_type=media_type, detail=detail, base64_data=base64_data)
+            _images_by_fingerprint[key] = image
+        return image
     
     def to_openai_format(self) -> Dict[str, Any]:
         """Convert to OpenAI API format."""
@@ -35,6 +131,15 @@ class ImageContent:
         }
 
 
+# Characters taken from each end of a base64 payload for its fingerprint
+_FINGERPRINT_CHARS = 64
+
+# Live base64 images keyed by (media type, detail, length, head, tail)
+_images_by_fingerprint: "weakref.WeakValueDictionary[tuple, ImageContent]" = (
+    weakref.WeakValueDictionary()
+)
+
+
 @dataclass
 class Message:
     """Base message class."""
@@ -43,9 +148,34 @@ class Message:
     content: Union[str, List[Union[str, ImageContent]]]
     name: Optional[str] = None
     cache: bool = False  # For API caching hints
+    _openai_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any field assignment invalidates the cached API format
+        object.__setattr__(self, name, value)
+        if name != "_openai_cache":
+            object.__setattr__(self, "_openai_cache", None)
     
     def to_openai_format(self) -> Dict[str, Any]:
-        """Convert to OpenAI API format."""
+        """
+        Convert to OpenAI API format.
+        
+        The result is cached until a field is reassigned; mutating a
+        content list in place is not detected.
+        """
+        msg = self._openai_cache
+        if msg is None:
+            msg = self._openai_cache = self._build_openai_format()
+        return msg
+    
+    def to_openai_json(self) -> bytes:
+        """Convert to OpenAI API format, encoded as JSON bytes."""
+        return encode_json(self.to_openai_format())
+    
+    def _build_openai_format(self) -> Dict[str, Any]:
+        """Build the OpenAI API format dict."""
         msg: Dict[str, Any] = {"role": self.role}
         
         if isinstance(self.content, str):
@@ -152,9 +282,9 @@ class AssistantMessage(Message):
         )
         self.tool_calls = tool_calls
     
-    def to_openai_format(self) -> Dict[str, Any]:
-        """Convert to OpenAI API format."""
-        msg = super().to_openai_format()
+    def _build_openai_format(self) -> Dict[str, Any]:
+        """Build the OpenAI API format dict."""
+        msg = super()._build_openai_format()
         if self.tool_calls:
             msg["tool_calls"] = self.tool_calls
         return msg
@@ -170,9 +300,13 @@ class MessageHistory:
         Args:
             max_messages: Maximum number of messages to keep (None = unlimited)
         """
-        self._messages: List[Message] = []
+        # A bounded deque drops the oldest message on append
+        self._messages: Union[List[Message], Deque[Message]] = (
+            deque(maxlen=max_messages) if max_messages else []
+        )
         self._max_messages = max_messages
         self._system_message: Optional[SystemMessage] = None
+        self._last_assistant: Optional[AssistantMessage] = None
     
     def set_system_message(self, message: SystemMessage) -> None:
         """Set the system message (always kept)."""
@@ -180,8 +314,19 @@ class MessageHistory:
     
     def add(self, message: Message) -> None:
         """Add a message to history."""
-        self._messages.append(message)
-        self._truncate_if_needed()
+        messages = self._messages
+        # The oldest message is about to be dropped; if it is the last
+        # assistant message, no other assistant message remains
+        if (
+            self._last_assistant is not None
+            and self._max_messages
+            and len(messages) == self._max_messages
+            and messages[0] is self._last_assistant
+        ):
+            self._last_assistant = None
+        messages.append(message)
+        if isinstance(message, AssistantMessage):
+            self._last_assistant = message
     
     def add_user(self, content: Union[str, List[Union[str, ImageContent]]]) -> None:
         """Add a user message."""
@@ -201,17 +346,20 @@ class MessageHistory:
     
     def to_openai_format(self) -> List[Dict[str, Any]]:
         """Convert all messages to OpenAI API format."""
-        return [msg.to_openai_format() for msg in self.get_messages()]
+        system = (self._system_message,) if self._system_message else ()
+        return [
+            msg.to_openai_format()
+            for msg in itertools.chain(system, self._messages)
+        ]
     
-    def _truncate_if_needed(self) -> None:
-        """Truncate history if max_messages is set."""
-        if self._max_messages and len(self._messages) > self._max_messages:
-            # Keep only the most recent messages
-            self._messages = self._messages[-self._max_messages:]
+    def to_openai_json(self) -> bytes:
+        """Convert all messages to OpenAI API format, encoded as JSON bytes."""
+        return encode_json(self.to_openai_format())
     
     def clear(self) -> None:
         """Clear message history (keeps system message)."""
         self._messages.clear()
+        self._last_assistant = None
     
     def __len__(self) -> int:
         """Get number of messages (excluding system)."""
@@ -219,8 +367,5 @@ class MessageHistory:
     
     def get_last_assistant_message(self) -> Optional[AssistantMessage]:
         """Get the last assistant message."""
-        for msg in reversed(self._messages):
-            if isinstance(msg, AssistantMessage):
-                return msg
-        return None
+        return self._last_assistant
 
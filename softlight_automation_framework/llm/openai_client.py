@@ -1,12 +1,23 @@
 """OpenAI GPT client for LLM operations."""
 
 import asyncio
+import hashlib
 import json
 import logging
+import math
+import random
 import time
-from typing import Any, Dict, List, Optional, Type, Union
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
-from openai import AsyncOpenAI
+import httpx
+from openai import (
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    RateLimitError,
+)
 from pydantic import BaseModel
 
 from softlight_automation_framework.core.config import LLMConfig
@@ -16,17 +27,70 @@ from softlight_automation_framework.core.exceptions import (
     LLMRateLimitError,
     LLMTimeoutError,
 )
+from softlight_automation_framework.llm.cache import SemanticCache
 from softlight_automation_framework.llm.messages import (
     Message,
     MessageHistory,
+    encode_json,
 )
 from softlight_automation_framework.llm.schema import (
     LLMResponse,
     AgentOutput,
 )
+from softlight_automation_framework.llm.throttle import TokenBucket
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:
+    h2 = None
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers match either
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Retry backoff: full jitter over BACKOFF_FACTOR * 2**attempt, capped (seconds)
+_BACKOFF_FACTOR = 1.0
+_MAX_BACKOFF = 60.0
+
+# 4xx statuses worth retrying (request timeout, conflict); other client
+# errors fail the same way on every attempt
+_RETRYABLE_CLIENT_STATUSES = frozenset((408, 409))
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    """Get the server's retry delay in seconds from a rate limit error, if any."""
+    headers = error.response.headers
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return float(value) / 1000
+        value = headers.get("retry-after")
+        if value is not None:
+            return float(value)
+    except ValueError:
+        pass
+    return None
+
+
+def _last_user_text(api_messages: List[Dict[str, Any]]) -> str:
+    """Get the text of the last user message (the part that changes per step)."""
+    for message in reversed(api_messages):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, str):
+            return content
+        return "\n".join(
+            part.get("text", "") for part in content or () if part.get("type") == "text"
+        )
+    return ""
+
 
 class OpenAIClient:
     """
@@ -47,6 +111,7 @@ class OpenAIClient:
         max_tokens: int = 4096,
         timeout: int = 60,
         config: Optional[LLMConfig] = None,
+        semantic_cache: Optional[SemanticCache] = None,
     ):
         """
         Initialize the OpenAI client.
@@ -58,6 +123,8 @@ class OpenAIClient:
             max_tokens: Maximum tokens in response
             timeout: Request timeout in seconds
             config: LLMConfig object (overrides other params)
+            semantic_cache: Cache for near-duplicate prompts (built from
+                config when ``enable_semantic_cache`` is set)
         """
         if config:
             self.config = config
@@ -70,12 +137,36 @@ class OpenAIClient:
                 timeout=timeout,
             )
         
-        # Initialize async client
+        # Initialize async client on a pooled, keep-alive HTTP client
+        # (the SDK's default client keeps its other settings, e.g. redirects)
+        self._http_client = DefaultAsyncHttpxClient(
+            http2=h2 is not None,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=60.0,
+            ),
+            timeout=httpx.Timeout(self.config.timeout, connect=5.0),
+        )
         self._client = AsyncOpenAI(
             api_key=self.config.api_key or None,  # Uses OPENAI_API_KEY env if None
             timeout=self.config.timeout,
+            http_client=self._http_client,
         )
         
+        if semantic_cache is None and self.config.enable_semantic_cache:
+            semantic_cache = SemanticCache(threshold=self.config.semantic_cache_threshold)
+        self._semantic_cache = semantic_cache
+        # Exact-match responses keyed by request hash, least recently used first
+        self._exact_cache: "OrderedDict[Tuple[bytes, Optional[type]], LLMResponse]" = OrderedDict()
+        
+        # Client-side throttling (a per-minute limit of 0 disables that bucket)
+        self._sem = asyncio.Semaphore(self.config.max_concurrency or 8)
+        rpm = self.config.requests_per_minute
+        tpm = self.config.tokens_per_minute
+        self._request_bucket = TokenBucket(rate=rpm / 60, capacity=rpm) if rpm > 0 else None
+        self._token_bucket = TokenBucket(rate=tpm / 60, capacity=tpm) if tpm > 0 else None
+        
         # Stats tracking
         self._total_prompt_tokens = 0
         self._total_completion_tokens = 0
@@ -111,6 +202,44 @@ class OpenAIClient:
         else:
             api_messages = messages
         
+        # Only deterministic completions are safe to reuse
+        reusable = self.config.temperature <= 0
+        
+        exact_key = None
+        if reusable and self.config.exact_cache_size > 0:
+            # Keyed on the format class itself: every with_action_schema
+            # class shares the name "AgentOutput"
+            exact_key = (
+                hashlib.blake2b(
+                    encode_json([
+                        self.config.model,
+                        self.config.temperature,
+                        self.config.max_tokens,
+                        api_messages,
+                    ]),
+                    digest_size=16,
+                ).digest(),
+                response_format,
+            )
+            cached = self._exact_cache.get(exact_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(exact_key)
+                logger.debug("LLM exact cache hit")
+                return cached.model_copy(update={"latency_ms": 0}, deep=True)
+        
+        cache = self._semantic_cache
+        embedding = None
+        # The shared system prompt would dominate the embedding, so only the
+        # latest user turn is compared; model and format must match exactly
+        semantic_scope = (self.config.model, response_format)
+        prompt = _last_user_text(api_messages) if reusable and cache is not None else ""
+        if prompt and cache.enabled:
+            embedding = await cache.embed(prompt)
+            cached = cache.lookup(embedding, semantic_scope)
+            if cached is not None:
+                logger.debug("LLM semantic cache hit")
+                return cached
+        
         # Prepare request parameters
         params: Dict[str, Any] = {
             "model": self.config.model,
@@ -125,75 +254,142 @@ class OpenAIClient:
             params["response_format"] = {"type": "json_object"}
         
         # Make request with retries
-        last_error = None
         start_time = time.time()
+        response = await self._do_request(params, max_retries)
+        
+        # Calculate latency
+        latency_ms = int((time.time() - start_time) * 1000)
+        
+        # Extract response data
+        choice = response.choices[0]
+        content = choice.message.content or ""
+        
+        # Parse structured output if expected
+        parsed = None
+        data = None
+        if response_format and content:
+            try:
+                data = _loads(content)
+                parsed = response_format(**data)
+            except (json.JSONDecodeError, Exception) as e:
+                logger.warning(f"Failed to parse structured output: {e}")
+        
+        # Update stats
+        usage = response.usage
+        if usage:
+            self._total_prompt_tokens += usage.prompt_tokens
+            self._total_completion_tokens += usage.completion_tokens
+        self._total_requests += 1
+        
+        logger.debug(
+            f"LLM response: {usage.prompt_tokens if usage else 0} prompt, "
+            f"{usage.completion_tokens if usage else 0} completion tokens, "
+            f"{latency_ms}ms"
+        )
+        
+        result = LLMResponse(
+            content=content,
+            parsed=parsed if isinstance(parsed, AgentOutput) else None,
+            parsed_any=parsed,
+            parsed_raw=data,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            total_tokens=usage.total_tokens if usage else 0,
+            latency_ms=latency_ms,
+            model=response.model,
+            finish_reason=choice.finish_reason or "stop",
+        )
+        if exact_key is not None or embedding is not None:
+            # Cache a private copy so changes the caller makes to its
+            # response never reach later hits
+            cached = result.model_copy(deep=True)
+            if exact_key is not None:
+                self._exact_cache[exact_key] = cached
+                if len(self._exact_cache) > self.config.exact_cache_size:
+                    self._exact_cache.popitem(last=False)
+            if embedding is not None:
+                cache.insert(embedding, semantic_scope, cached)
+        return result
+    
+    def _estimate_tokens(self, params: Dict[str, Any]) -> int:
+        """Roughly estimate a request's token cost (4 chars per token plus max output)."""
+        chars = 0
+        for message in params["messages"]:
+            content = message.get("content")
+            if isinstance(content, str):
+                chars += len(content)
+            elif content:
+                chars += sum(len(part.get("text", "")) for part in content)
+        return chars // 4 + self.config.max_tokens
+    
+    async def _do_request(self, params: Dict[str, Any], max_retries: int) -> Any:
+        """
+        Create a chat completion, retrying transient failures.
+        
+        Waits use exponential backoff with full jitter (a random delay up
+        to ``_BACKOFF_FACTOR * 2 ** attempt``), or the server's Retry-After
+        hint when one is sent; either is capped at ``_MAX_BACKOFF`` seconds.
+        
+        Every error is retried except 4xx client errors such as bad
+        requests, authentication or permission failures and unknown
+        models, which are raised at once.
+        
+        Args:
+            params: Chat completion request parameters
+            max_retries: Maximum number of attempts
+            
+        Returns:
+            Raw chat completion response
+        """
+        last_error: Optional[LLMError] = None
         
         for attempt in range(max_retries):
+            retry_after = None
             try:
-                response = await asyncio.wait_for(
-                    self._client.chat.completions.create(**params),
-                    timeout=self.config.timeout
-                )
-                
-                # Calculate latency
-                latency_ms = int((time.time() - start_time) * 1000)
-                
-                # Extract response data
-                choice = response.choices[0]
-                content = choice.message.content or ""
-                
-                # Parse structured output if expected
-                parsed = None
-                if response_format and content:
-                    try:
-                        data = json.loads(content)
-                        parsed = response_format(**data)
-                    except (json.JSONDecodeError, Exception) as e:
-                        logger.warning(f"Failed to parse structured output: {e}")
+                # Rate limits first, so a throttled request does not hold
+                # a concurrency slot while it waits
+                if self._request_bucket is not None:
+                    await self._request_bucket.acquire()
+                if self._token_bucket is not None:
+                    await self._token_bucket.acquire(self._estimate_tokens(params))
+                async with self._sem:
+                    return await asyncio.wait_for(
+                        self._client.chat.completions.create(**params),
+                        timeout=self.config.timeout
+                    )
                 
-                # Update stats
-                usage = response.usage
-                if usage:
-                    self._total_prompt_tokens += usage.prompt_tokens
-                    self._total_completion_tokens += usage.completion_tokens
-                self._total_requests += 1
+            except (asyncio.TimeoutError, APITimeoutError):
+                last_error = LLMTimeoutError(self.config.timeout)
+                logger.warning(f"LLM request timeout (attempt {attempt + 1}/{max_retries})")
                 
-                logger.debug(
-                    f"LLM response: {usage.prompt_tokens if usage else 0} prompt, "
-                    f"{usage.completion_tokens if usage else 0} completion tokens, "
-                    f"{latency_ms}ms"
+            except RateLimitError as e:
+                retry_after = _retry_after(e)
+                last_error = LLMRateLimitError(
+                    retry_after=math.ceil(retry_after) if retry_after is not None else None
                 )
+                logger.warning(f"Rate limit hit (attempt {attempt + 1}/{max_retries})")
                 
-                return LLMResponse(
-                    content=content,
-                    parsed=parsed if isinstance(parsed, AgentOutput) else None,
-                    prompt_tokens=usage.prompt_tokens if usage else 0,
-                    completion_tokens=usage.completion_tokens if usage else 0,
-                    total_tokens=usage.total_tokens if usage else 0,
-                    latency_ms=latency_ms,
-                    model=response.model,
-                    finish_reason=choice.finish_reason or "stop",
-                )
-                
-            except asyncio.TimeoutError:
-                last_error = LLMTimeoutError(self.config.timeout)
-                logger.warning(f"LLM request timeout (attempt {attempt + 1}/{max_retries})")
+            except APIStatusError as e:
+                if 400 <= e.status_code < 500 and e.status_code not in _RETRYABLE_CLIENT_STATUSES:
+                    logger.error(f"LLM error: {e}")
+                    raise LLMError(str(e), model=self.config.model) from e
+                last_error = LLMError(str(e), model=self.config.model)
+                logger.warning(f"LLM error (attempt {attempt + 1}/{max_retries}): {e}")
                 
             except Exception as e:
-                error_str = str(e).lower()
-                
-                if "rate_limit" in error_str or "429" in error_str:
-                    last_error = LLMRateLimitError()
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    logger.warning(f"Rate limit hit, waiting {wait_time}s")
-                    await asyncio.sleep(wait_time)
-                else:
-                    last_error = LLMError(str(e), model=self.config.model)
-                    logger.error(f"LLM error (attempt {attempt + 1}/{max_retries}): {e}")
+                last_error = LLMError(str(e), model=self.config.model)
+                logger.warning(f"LLM error (attempt {attempt + 1}/{max_retries}): {e}")
             
             # Wait before retry
             if attempt < max_retries - 1:
-                await asyncio.sleep(1)
+                if retry_after is None:
+                    retry_after = random.uniform(
+                        0, min(_MAX_BACKOFF, _BACKOFF_FACTOR * 2 ** attempt)
+                    )
+                else:
+                    retry_after = min(retry_after, _MAX_BACKOFF)
+                logger.debug(f"Retrying LLM request in {retry_after:.2f}s")
+                await asyncio.sleep(retry_after)
         
         raise last_error or LLMError("Unknown LLM error")
     
@@ -222,11 +418,16 @@ class OpenAIClient:
             response_format=output_schema,
         )
         
+        if isinstance(response.parsed_any, output_schema):
+            return response.parsed_any
+        
         if not response.content:
             raise LLMResponseError("Empty response from LLM")
         
         try:
-            data = json.loads(response.content)
+            data = response.parsed_raw
+            if data is None:
+                data = _loads(response.content)
             return output_schema(**data)
         except json.JSONDecodeError as e:
             raise LLMResponseError(
@@ -262,6 +463,16 @@ class OpenAIClient:
         response = await self.complete(messages)
         return response.content
     
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._http_client.aclose()
+    
+    async def __aenter__(self) -> "OpenAIClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+    
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get cumulative usage statistics."""
         return {
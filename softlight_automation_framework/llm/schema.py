@@ -1,5 +1,6 @@
 """Output schemas for LLM responses."""
 
+import functools
 from typing import Any, Dict, List, Optional, Type
 from pydantic import BaseModel, Field, create_model
 
@@ -60,15 +61,29 @@ class AgentOutput(BaseModel):
         cls,
         action_model: Type[BaseModel]
     ) -> Type["AgentOutput"]:
-        """Create AgentOutput with specific action schema."""
-        return create_model(
-            "AgentOutput",
-            __base__=cls,
-            action=(
-                List[action_model],
-                Field(description="Actions to execute")
-            )
+        """
+        Create AgentOutput with specific action schema.
+        
+        Generated classes are cached for the most recently used action
+        models, so repeated calls return the same compiled class.
+        """
+        return _build_agent_output(cls, action_model)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_agent_output(
+    base: Type[AgentOutput],
+    action_model: Type[BaseModel]
+) -> Type[AgentOutput]:
+    """Build an AgentOutput subclass whose actions use ``action_model``."""
+    return create_model(
+        "AgentOutput",
+        __base__=base,
+        action=(
+            List[action_model],
+            Field(description="Actions to execute")
         )
+    )
 
 
 class LLMResponse(BaseModel):
@@ -82,6 +97,16 @@ class LLMResponse(BaseModel):
         default=None,
         description="Parsed agent output"
     )
+    parsed_any: Optional[BaseModel] = Field(
+        default=None,
+        description="Parsed structured output of any response_format model"
+    )
+    
+    # Decoded JSON content (if JSON mode), reused to avoid parsing twice
+    parsed_raw: Optional[Any] = Field(
+        default=None,
+        description="Decoded JSON response content"
+    )
     
     # Usage statistics
     prompt_tokens: int = Field(default=0)
@@ -0,0 +1,57 @@
+"""Client-side rate limiting for LLM requests."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+    
+    Holds up to ``capacity`` tokens, refilled continuously at ``rate``
+    tokens per second. Waiters are served in arrival order: each one
+    reserves its tokens on arrival (the balance may go negative) and
+    then sleeps, without holding anything, until the refill covers its
+    reservation.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self, cost: float = 1) -> None:
+        """
+        Wait until ``cost`` tokens are available, then take them.
+        
+        Costs above capacity are clamped so they cannot wait forever.
+        A cancelled wait gives its reservation back.
+        
+        Args:
+            cost: Tokens to take
+        """
+        cost = min(cost, self.capacity)
+        # No await between the refill and the reservation, so concurrent
+        # callers cannot interleave here
+        self._refill()
+        self._tokens -= cost
+        if self._tokens >= 0:
+            return
+        try:
+            await asyncio.sleep(-self._tokens / self.rate)
+        except asyncio.CancelledError:
+            self._tokens += cost
+            raise
@@ -5,6 +5,11 @@ import logging
 import urllib.parse
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from softlight_automation_framework.tools.registry import ToolRegistry
 from softlight_automation_framework.tools.views import (
     ActionResult,
@@ -329,8 +334,11 @@ def register_default_actions(registry: ToolRegistry) -> None:
             if result is None:
                 result_str = "undefined"
             elif isinstance(result, (dict, list)):
-                import json
-                result_str = json.dumps(result, indent=2)
+                if orjson is not None:
+                    result_str = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+                else:
+                    import json
+                    result_str = json.dumps(result, indent=2)
             else:
                 result_str = str(result)
             
@@ -167,6 +167,7 @@ class TutorialAgent:
         
         # LLM and browser (may be created later)
         self._llm = llm
+        self._owns_llm = False
         self._browser = browser
         self._owns_browser = browser is None
         
@@ -302,6 +303,7 @@ IMPORTANT: Take ONE action at a time for clear tutorial steps!
         """Get or create LLM client."""
         if self._llm is None:
             self._llm = OpenAIClient(model="gpt-4o")
+            self._owns_llm = True
         return self._llm
     
     async def _ensure_browser(self) -> BrowserSession:
@@ -408,6 +410,12 @@ IMPORTANT: Take ONE action at a time for clear tutorial steps!
                 await self._browser.stop()
                 self._browser = None
             
+            # Close the LLM connection pool if we created it
+            if self._owns_llm and self._llm:
+                await self._llm.aclose()
+                self._llm = None
+                self._owns_llm = False
+            
             duration = (self.state.end_time - self.state.start_time).total_seconds()
             logger.info(f"🎬 Tutorial capture complete: {self.state.n_steps} steps, {duration:.1f}s")
     
@@ -709,17 +717,16 @@ async def run_tutorial(
     Returns:
         TutorialWorkflow with captured steps
     """
-    llm = OpenAIClient(model=model)
-    
-    agent = TutorialAgent(
-        query=query,
-        llm=llm,
-        start_url=start_url,
-        app_hint=app_hint,
-        max_steps=max_steps,
-        headless=headless,
-        datasets_dir=datasets_dir,
-    )
-    
-    return await agent.run()
+    async with OpenAIClient(model=model) as llm:
+        agent = TutorialAgent(
+            query=query,
+            llm=llm,
+            start_url=start_url,
+            app_hint=app_hint,
+            max_steps=max_steps,
+            headless=headless,
+            datasets_dir=datasets_dir,
+        )
+        
+        return await agent.run()
 
@@ -134,45 +134,44 @@ def interactive(output: str, model: str, headless: bool):
         from softlight_automation_framework.tutorial.agent import TutorialAgent
         from softlight_automation_framework.llm.openai_client import OpenAIClient
         
-        llm = OpenAIClient(model=model)
-        
-        while True:
-            console.print()
-            query = Prompt.ask("[bold green]Agent A[/bold green]")
-            
-            if query.lower() in ["quit", "exit", "q"]:
-                console.print("[yellow]Goodbye![/yellow]")
-                break
-            
-            if not query.strip():
-                continue
-            
-            console.print(f"\n[cyan]Agent B:[/cyan] Starting to capture workflow for: [italic]{query}[/italic]\n")
-            
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task = progress.add_task("Capturing workflow...", total=None)
+        async with OpenAIClient(model=model) as llm:
+            while True:
+                console.print()
+                query = Prompt.ask("[bold green]Agent A[/bold green]")
                 
-                try:
-                    agent = TutorialAgent(
-                        query=query,
-                        llm=llm,
-                        max_steps=20,
-                        headless=headless,
-                        datasets_dir=output,
-                    )
-                    
-                    workflow = await agent.run()
-                    
-                    progress.remove_task(task)
-                    _display_workflow_results(workflow)
+                if query.lower() in ["quit", "exit", "q"]:
+                    console.print("[yellow]Goodbye![/yellow]")
+                    break
+                
+                if not query.strip():
+                    continue
+                
+                console.print(f"\n[cyan]Agent B:[/cyan] Starting to capture workflow for: [italic]{query}[/italic]\n")
+                
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console,
+                ) as progress:
+                    task = progress.add_task("Capturing workflow...", total=None)
                     
-                except Exception as e:
-                    progress.remove_task(task)
-                    console.print(f"[red]Error:[/red] {e}")
+                    try:
+                        agent = TutorialAgent(
+                            query=query,
+                            llm=llm,
+                            max_steps=20,
+                            headless=headless,
+                            datasets_dir=output,
+                        )
+                        
+                        workflow = await agent.run()
+                        
+                        progress.remove_task(task)
+                        _display_workflow_results(workflow)
+                        
+                    except Exception as e:
+                        progress.remove_task(task)
+                        console.print(f"[red]Error:[/red] {e}")
     
     asyncio.run(run_interactive())
 
@@ -0,0 +1,118 @@
+"""Tests for the semantic LLM response cache."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydantic")
+
+from softlight_automation_framework.llm.cache import SemanticCache  # noqa: E402
+from softlight_automation_framework.llm.schema import LLMResponse  # noqa: E402
+
+SCOPE = ("gpt-4o", None)
+
+
+def _cache(**kwargs):
+    # Embeddings are passed in directly, so sentence-transformers is not needed
+    cache = SemanticCache(**kwargs)
+    cache.enabled = True
+    return cache
+
+
+def _unit(index, size=8):
+    return np.eye(size)[index]
+
+
+def _between(a, b, similarity):
+    """Unit vector with the given cosine similarity to ``a``, leaning towards ``b``."""
+    return similarity * _unit(a) + np.sqrt(1 - similarity ** 2) * _unit(b)
+
+
+def _response(content):
+    return LLMResponse(content=content, parsed_raw={"items": [content]}, latency_ms=900)
+
+
+def test_threshold():
+    cache = _cache(threshold=0.9)
+    cache.insert(_unit(0), SCOPE, _response("a"))
+
+    assert cache.lookup(_unit(0), SCOPE).content == "a"
+    assert cache.lookup(_between(0, 1, 0.95), SCOPE).content == "a"
+    assert cache.lookup(_between(0, 1, 0.85), SCOPE) is None
+
+
+def test_best_match_wins():
+    cache = _cache(threshold=0.5)
+    cache.insert(_unit(0), SCOPE, _response("a"))
+    cache.insert(_unit(1), SCOPE, _response("b"))
+    assert cache.lookup(_between(1, 0, 0.8), SCOPE).content == "b"
+
+
+def test_scope_isolation():
+    cache = _cache()
+    cache.insert(_unit(0), ("gpt-4o", None), _response("a"))
+    cache.insert(_unit(0), ("gpt-4o-mini", None), _response("b"))
+
+    assert cache.lookup(_unit(0), ("gpt-4o", None)).content == "a"
+    assert cache.lookup(_unit(0), ("gpt-4o-mini", None)).content == "b"
+    assert cache.lookup(_unit(0), ("gpt-4o", dict)) is None
+
+
+def test_short_term_tier_evicts_least_recently_used():
+    cache = _cache(short_term_size=2, promote_every=100)
+    cache.insert(_unit(0), SCOPE, _response("a"))
+    cache.insert(_unit(1), SCOPE, _response("b"))
+    # Touch "a" so "b" is the least recently used
+    assert cache.lookup(_unit(0), SCOPE) is not None
+    cache.insert(_unit(2), SCOPE, _response("c"))
+
+    assert len(cache) == 2
+    assert cache.lookup(_unit(1), SCOPE) is None
+    assert cache.lookup(_unit(0), SCOPE).content == "a"
+    assert cache.lookup(_unit(2), SCOPE).content == "c"
+
+
+def test_long_term_tier_keeps_most_frequently_used():
+    cache = _cache(short_term_size=8, long_term_size=1, promote_hits=1, promote_every=3)
+    cache.insert(_unit(0), SCOPE, _response("a"))
+    cache.insert(_unit(1), SCOPE, _response("b"))
+    for _ in range(2):
+        cache.lookup(_unit(0), SCOPE)
+    cache.lookup(_unit(1), SCOPE)
+    # Third insert runs a promotion pass: both move up, only "a" fits
+    cache.insert(_unit(2), SCOPE, _response("c"))
+
+    assert [e.response.content for e in cache._long_term] == ["a"]
+    assert cache.lookup(_unit(1), SCOPE) is None
+    assert cache.lookup(_unit(0), SCOPE).content == "a"
+    assert cache.lookup(_unit(2), SCOPE).content == "c"
+
+
+def test_hits_are_independent_copies():
+    cache = _cache()
+    cache.insert(_unit(0), SCOPE, _response("a"))
+
+    first = cache.lookup(_unit(0), SCOPE)
+    assert first.latency_ms == 0
+    first.content = "changed"
+    first.parsed_raw["items"].append("changed")
+
+    second = cache.lookup(_unit(0), SCOPE)
+    assert second is not first
+    assert second.content == "a"
+    assert second.parsed_raw == {"items": ["a"]}
+
+
+def test_disabled_cache_always_misses():
+    cache = SemanticCache()
+    cache.enabled = False
+    cache.insert(_unit(0), SCOPE, _response("a"))
+    assert len(cache) == 0
+    assert cache.lookup(_unit(0), SCOPE) is None
+
+
+def test_clear():
+    cache = _cache()
+    cache.insert(_unit(0), SCOPE, _response("a"))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.lookup(_unit(0), SCOPE) is None
@@ -0,0 +1,49 @@
+"""Tests for environment-based configuration."""
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from softlight_automation_framework.core.config import (  # noqa: E402
+    BrowserConfig,
+    Config,
+)
+
+
+def test_from_env_returns_independent_instances():
+    first = Config.from_env()
+    second = Config.from_env()
+    assert first == second
+
+    first.log_level = "DEBUG"
+    first.browser.headless = not first.browser.headless
+    first.llm.model = "changed"
+
+    assert second.log_level != "DEBUG"
+    assert second.browser.headless != first.browser.headless
+    assert second.llm.model != "changed"
+    assert Config.from_env() == second
+
+
+def test_child_from_env_returns_independent_instances():
+    first = BrowserConfig.from_env()
+    first.viewport_width += 1
+    assert BrowserConfig.from_env().viewport_width == first.viewport_width - 1
+
+
+def test_reload_rereads_environment(monkeypatch):
+    before = BrowserConfig.from_env().viewport_width
+    monkeypatch.setenv("BROWSER_VIEWPORT_WIDTH", str(before + 1))
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+    try:
+        # The snapshot only changes on reload
+        assert BrowserConfig.from_env().viewport_width == before
+
+        config = Config.reload()
+        assert config.browser.viewport_width == before + 1
+        assert config.log_level == "WARNING"
+        assert BrowserConfig.from_env().viewport_width == before + 1
+    finally:
+        monkeypatch.undo()
+        Config.reload()
+    assert BrowserConfig.from_env().viewport_width == before
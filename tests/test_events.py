@@ -0,0 +1,240 @@
+"""Tests for BrowserEventBus backpressure and nested dispatch."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from softlight_automation_framework.browser.events import (  # noqa: E402
+    BrowserEventBus,
+    ClickEvent,
+    EventType,
+    NavigationEvent,
+    ScrollEvent,
+    _EventPool,
+)
+from softlight_automation_framework.core.exceptions import BrowserError  # noqa: E402
+
+
+def _gated_bus(**kwargs):
+    """Bus whose click handler waits on a gate and records start order."""
+    bus = BrowserEventBus(**kwargs)
+    gate = asyncio.Event()
+    started = []
+
+    async def handler(event):
+        started.append(event.index)
+        await gate.wait()
+        return event.index
+
+    bus.subscribe(EventType.CLICK, handler)
+    return bus, gate, started
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        BrowserEventBus(overflow_policy="spill")
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"max_concurrent": 1},
+    {"max_pending": 1, "overflow_policy": "block"},
+])
+def test_nested_dispatch_does_not_deadlock(kwargs):
+    async def main():
+        bus = BrowserEventBus(**kwargs)
+
+        async def on_navigate(event):
+            inner = await bus.dispatch(ClickEvent(index=7))
+            return inner.result
+
+        bus.subscribe(EventType.NAVIGATION, on_navigate)
+        bus.subscribe(EventType.CLICK, lambda event: event.index * 2)
+
+        event = await asyncio.wait_for(bus.dispatch(NavigationEvent(url="x")), 1)
+        assert event.result == 14
+        assert bus.pending_count == 0
+
+    asyncio.run(main())
+
+
+def test_block_waits_for_room():
+    async def main():
+        bus, gate, started = _gated_bus(max_pending=1, overflow_policy="block")
+        first = asyncio.create_task(bus.dispatch(ClickEvent(index=1)))
+        second = asyncio.create_task(bus.dispatch(ClickEvent(index=2)))
+        await asyncio.sleep(0.05)
+        assert started == [1]
+        assert not second.done()
+
+        gate.set()
+        results = await asyncio.wait_for(asyncio.gather(first, second), 1)
+        assert [e.result for e in results] == [1, 2]
+        assert started == [1, 2]
+        assert bus.dropped_count == 0
+        assert bus.pending_count == 0
+
+    asyncio.run(main())
+
+
+def test_block_wakes_waiters_in_arrival_order():
+    async def main():
+        bus, gate, started = _gated_bus(max_pending=1, overflow_policy="block")
+        tasks = [asyncio.create_task(bus.dispatch(ClickEvent(index=i))) for i in range(1, 5)]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        assert started == [1, 2, 3, 4]
+
+    asyncio.run(main())
+
+
+def test_cancelled_blocked_dispatch_passes_room_on():
+    async def main():
+        bus, gate, started = _gated_bus(max_pending=1, overflow_policy="block")
+        first = asyncio.create_task(bus.dispatch(ClickEvent(index=1)))
+        cancelled = asyncio.create_task(bus.dispatch(ClickEvent(index=2)))
+        third = asyncio.create_task(bus.dispatch(ClickEvent(index=3)))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(first, third), 1)
+        assert started == [1, 3]
+
+    asyncio.run(main())
+
+
+def test_drop_newest_rejects_incoming_event():
+    async def main():
+        bus, gate, started = _gated_bus(max_pending=1, overflow_policy="drop_newest")
+        first = asyncio.create_task(bus.dispatch(ClickEvent(index=1)))
+        await asyncio.sleep(0)
+
+        dropped = await bus.dispatch(ClickEvent(index=2))
+        assert isinstance(dropped.exception, BrowserError)
+        assert bus.dropped_count == 1
+
+        gate.set()
+        assert (await first).result == 1
+        assert started == [1]
+
+    asyncio.run(main())
+
+
+def test_drop_oldest_sheds_waiting_event():
+    async def main():
+        bus, gate, started = _gated_bus(
+            max_concurrent=1, max_pending=2, overflow_policy="drop_oldest"
+        )
+        running = asyncio.create_task(bus.dispatch(ClickEvent(index=1)))
+        waiting = asyncio.create_task(bus.dispatch(ClickEvent(index=2)))
+        await asyncio.sleep(0)
+        newest = asyncio.create_task(bus.dispatch(ClickEvent(index=3)))
+        await asyncio.sleep(0)
+
+        gate.set()
+        running, waiting, newest = await asyncio.wait_for(
+            asyncio.gather(running, waiting, newest), 1
+        )
+        # The running event is never shed; the waiting one is
+        assert running.result == 1
+        assert isinstance(waiting.exception, BrowserError)
+        assert newest.result == 3
+        assert started == [1, 3]
+        assert bus.dropped_count == 1
+
+    asyncio.run(main())
+
+
+def test_handlers_run_concurrently():
+    async def main():
+        bus = BrowserEventBus()
+        ready = asyncio.Event()
+
+        async def waits_for_other(event):
+            await ready.wait()
+            return "first"
+
+        async def releases_other(event):
+            ready.set()
+
+        # Run one after the other, the first handler would never finish
+        bus.subscribe(EventType.CLICK, waits_for_other)
+        bus.subscribe(EventType.CLICK, releases_other)
+        event = await asyncio.wait_for(bus.dispatch(ClickEvent(index=1)), 1)
+        assert event.result == "first"
+
+    asyncio.run(main())
+
+
+def test_first_handler_error_wins():
+    async def main():
+        bus = BrowserEventBus()
+        seen = []
+
+        def fails(event):
+            raise ValueError("boom")
+
+        bus.subscribe(EventType.CLICK, lambda event: "ok")
+        bus.subscribe(EventType.CLICK, fails)
+        bus.subscribe_all(seen.append)
+
+        event = await bus.dispatch(ClickEvent(index=1))
+        assert isinstance(event.exception, ValueError)
+        assert event.result is None
+        # Global handlers still see the event
+        assert seen == [event]
+
+    asyncio.run(main())
+
+
+def test_pooled_events_start_fresh():
+    async def main():
+        bus = BrowserEventBus()
+        bus.subscribe(EventType.SCROLL, lambda event: event.amount)
+        pool = _EventPool(ScrollEvent, max_size=1)
+
+        first = pool.acquire(direction="up", amount=300)
+        await bus.dispatch(first)
+        assert first.result == 300
+        pool.release(first)
+
+        second = pool.acquire(amount=50)
+        assert second is first
+        # No future, result or field values carried over
+        assert not second.done()
+        assert second.result is None
+        assert second.direction == "down"
+        assert second.index is None
+
+        await bus.dispatch(second)
+        assert second.result == 50
+
+    asyncio.run(main())
+
+
+def test_pool_only_takes_back_completed_events():
+    pool = _EventPool(ScrollEvent)
+    event = pool.acquire(amount=10)
+    pool.release(event)
+    assert pool.acquire() is not event
+
+    with pytest.raises(TypeError):
+        pool.acquire(bogus=1)
+
+
+def test_dispatch_sync():
+    bus = BrowserEventBus()
+    bus.subscribe(EventType.CLICK, lambda event: event.index + 1)
+    assert bus.dispatch_sync(ClickEvent(index=1)).result == 2
+
+
+def test_dispatch_sync_inside_running_loop_raises():
+    async def main():
+        bus = BrowserEventBus()
+        bus.subscribe(EventType.CLICK, lambda event: None)
+        with pytest.raises(RuntimeError):
+            bus.dispatch_sync(ClickEvent(index=1))
+
+    asyncio.run(main())
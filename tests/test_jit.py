@@ -0,0 +1,38 @@
+"""Tests for the optional Numba sort kernel."""
+
+import random
+
+import pytest
+
+from softlight_automation_framework.dom.views import InteractiveElementsSoA
+
+pytest.importorskip("numpy")
+pytest.importorskip("numba")
+
+from softlight_automation_framework.dom._jit import sort_visible_rows  # noqa: E402
+
+
+def _columns(rng: random.Random, count: int) -> InteractiveElementsSoA:
+    # Few distinct coordinates so many rows tie on (y, x)
+    return InteractiveElementsSoA.from_elements(
+        {
+            "index": i,
+            "tag_name": "a",
+            "is_visible": rng.random() > 0.2,
+            "bounds": {"x": rng.randrange(4) * 10.0, "y": rng.randrange(8) * 5.0},
+        }
+        for i in range(count)
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_jit_order_matches_python(seed):
+    columns = _columns(random.Random(seed), 1200)
+    assert sort_visible_rows(columns.ys, columns.xs, columns.flags) == columns.sorted_rows()
+
+
+def test_jit_order_keeps_row_order_on_ties():
+    columns = InteractiveElementsSoA.from_elements(
+        {"index": i, "bounds": {"x": 0.0, "y": 0.0}} for i in range(10)
+    )
+    assert sort_visible_rows(columns.ys, columns.xs, columns.flags) == list(range(10))
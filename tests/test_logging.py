@@ -0,0 +1,30 @@
+"""Tests for structured logging helpers."""
+
+import pytest
+
+structlog = pytest.importorskip("structlog")
+
+from softlight_automation_framework.core.logging import LogContext, get_logger  # noqa: E402
+
+
+def _context():
+    return structlog.contextvars.get_contextvars()
+
+
+def test_log_context_binds_and_resets():
+    structlog.contextvars.bind_contextvars(step=1)
+    try:
+        with LogContext(get_logger("test"), step=2, action="click") as log:
+            assert _context() == {"step": 2, "action": "click"}
+            assert structlog.get_context(log) == {"step": 2, "action": "click"}
+        assert _context() == {"step": 1}
+    finally:
+        structlog.contextvars.clear_contextvars()
+
+
+def test_log_context_resets_when_block_raises():
+    with pytest.raises(RuntimeError):
+        with LogContext(get_logger("test"), task="t1"):
+            assert _context() == {"task": "t1"}
+            raise RuntimeError("boom")
+    assert _context() == {}
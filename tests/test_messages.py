@@ -0,0 +1,88 @@
+"""Tests for LLM message types."""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from softlight_automation_framework.llm.messages import (  # noqa: E402
+    ImageContent,
+    MessageHistory,
+    SystemMessage,
+    UserMessage,
+)
+
+
+def _payload(middle: str) -> str:
+    return "A" * 100 + middle + "Z" * 100
+
+
+def test_from_base64_shares_identical_payloads():
+    first = ImageContent.from_base64(_payload("same"))
+    second = ImageContent.from_base64(_payload("same"))
+    assert first is second
+
+
+def test_from_base64_fingerprint_collision_gives_distinct_images():
+    # Same length, head and tail: only the middle differs
+    first = ImageContent.from_base64(_payload("left"))
+    second = ImageContent.from_base64(_payload("rght"))
+    assert first is not second
+    assert first != second
+    assert first.base64_data == _payload("left")
+    assert second.base64_data == _payload("rght")
+    assert second.url.endswith(_payload("rght"))
+
+
+def test_image_content_is_read_only():
+    image = ImageContent.from_base64(_payload("ro"))
+    for name in ("url", "media_type", "detail", "base64_data"):
+        with pytest.raises(AttributeError):
+            setattr(image, name, None)
+    with pytest.raises(AttributeError):
+        image.extra = 1
+
+
+def test_equal_images_hash_equal():
+    data = _payload("eq")
+    from_data = ImageContent(base64_data=data, detail="low")
+    from_url = ImageContent(url=f"data:image/png;base64,{data}", detail="low")
+    assert from_data == from_url
+    assert hash(from_data) == hash(from_url)
+    assert len({from_data, from_url}) == 1
+    assert from_data != ImageContent(base64_data=data, detail="high")
+
+
+def test_image_content_needs_a_source():
+    with pytest.raises(ValueError):
+        ImageContent()
+
+
+def test_openai_format_cache_invalidated_on_assignment():
+    message = UserMessage(content="first")
+    assert message.to_openai_format() == {"role": "user", "content": "first"}
+    assert message.to_openai_format() is message.to_openai_format()
+
+    message.content = "second"
+    assert message.to_openai_format() == {"role": "user", "content": "second"}
+    message.name = "tester"
+    assert message.to_openai_format()["name"] == "tester"
+
+
+def test_history_drops_oldest_and_tracks_last_assistant():
+    history = MessageHistory(max_messages=2)
+    history.set_system_message(SystemMessage(content="system"))
+    history.add_assistant("reply")
+    assert history.get_last_assistant_message().content == "reply"
+
+    history.add_user("one")
+    history.add_user("two")
+    # The only assistant message was pushed out
+    assert len(history) == 2
+    assert history.get_last_assistant_message() is None
+    assert [m["content"] for m in history.to_openai_format()] == ["system", "one", "two"]
+
+    history.add_assistant("again")
+    assert history.get_last_assistant_message().content == "again"
+    history.clear()
+    assert history.get_last_assistant_message() is None
+    assert [m["role"] for m in history.to_openai_format()] == ["system"]
@@ -0,0 +1,273 @@
+"""Tests for OpenAIClient retries, backoff and caching."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+httpx = pytest.importorskip("httpx")
+openai = pytest.importorskip("openai")
+
+from softlight_automation_framework.core.config import LLMConfig  # noqa: E402
+from softlight_automation_framework.core.exceptions import (  # noqa: E402
+    LLMError,
+    LLMRateLimitError,
+)
+from softlight_automation_framework.llm import openai_client  # noqa: E402
+from softlight_automation_framework.llm.cache import SemanticCache  # noqa: E402
+from softlight_automation_framework.llm.openai_client import (  # noqa: E402
+    OpenAIClient,
+    _MAX_BACKOFF,
+    _retry_after,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(cls, status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=_REQUEST)
+    return cls(f"status {status}", response=response, body=None)
+
+
+def _completion(content="ok"):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(content=content), finish_reason="stop"
+        )],
+        usage=SimpleNamespace(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+        model="test-model",
+    )
+
+
+class _FakeCompletions:
+    """Stands in for client.chat.completions, replaying scripted outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    async def create(self, **params):
+        self.calls.append(params)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _client(outcomes, **config):
+    client = OpenAIClient(config=LLMConfig(api_key="test", **config))
+    completions = _FakeCompletions(outcomes)
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client, completions
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry waits instead of sleeping; jitter returns its upper bound."""
+    waits = []
+
+    async def fake_sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(openai_client.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(openai_client.random, "uniform", lambda low, high: high)
+    return waits
+
+
+def _run(client, max_retries=3):
+    async def main():
+        try:
+            return await client.complete(
+                [{"role": "user", "content": "hi"}], max_retries=max_retries
+            )
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after-ms": "1500"}, 1.5),
+    ({"retry-after": "7"}, 7.0),
+    # The millisecond header is more precise and wins
+    ({"retry-after-ms": "250", "retry-after": "7"}, 0.25),
+    ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, None),
+    ({}, None),
+])
+def test_retry_after_parsing(headers, expected):
+    error = _status_error(openai.RateLimitError, 429, headers)
+    assert _retry_after(error) == expected
+
+
+def test_backoff_grows_exponentially(sleeps):
+    error = openai.APIConnectionError(request=_REQUEST)
+    client, completions = _client([error, error, error, _completion()])
+    response = _run(client, max_retries=4)
+    assert response.content == "ok"
+    assert len(completions.calls) == 4
+    assert sleeps == [1.0, 2.0, 4.0]
+
+
+def test_backoff_is_capped(sleeps, monkeypatch):
+    monkeypatch.setattr(openai_client, "_BACKOFF_FACTOR", 50.0)
+    error = _status_error(openai.InternalServerError, 500)
+    client, _ = _client([error, error, _completion()])
+    _run(client)
+    assert sleeps == [50.0, _MAX_BACKOFF]
+
+
+def test_rate_limit_waits_for_retry_after(sleeps):
+    errors = [
+        _status_error(openai.RateLimitError, 429, {"retry-after-ms": "1500"}),
+        _status_error(openai.RateLimitError, 429, {"retry-after": "3600"}),
+    ]
+    client, _ = _client(errors + [_completion()])
+    _run(client)
+    # The server hint is used as-is, but never beyond the backoff cap
+    assert sleeps == [1.5, _MAX_BACKOFF]
+
+
+def test_rate_limit_error_after_last_attempt(sleeps):
+    error = _status_error(openai.RateLimitError, 429, {"retry-after": "2.2"})
+    client, completions = _client([error, error])
+    with pytest.raises(LLMRateLimitError) as info:
+        _run(client, max_retries=2)
+    assert info.value.retry_after == 3
+    assert len(completions.calls) == 2
+    assert sleeps == [2.2]
+
+
+@pytest.mark.parametrize("error", [
+    _status_error(openai.InternalServerError, 503),
+    _status_error(openai.ConflictError, 409),
+    openai.APIConnectionError(request=_REQUEST),
+    ValueError("unexpected payload"),
+])
+def test_transient_errors_are_retried(sleeps, error):
+    client, completions = _client([error, _completion()])
+    assert _run(client).content == "ok"
+    assert len(completions.calls) == 2
+
+
+@pytest.mark.parametrize("cls, status", [
+    (openai.BadRequestError, 400),
+    (openai.AuthenticationError, 401),
+    (openai.PermissionDeniedError, 403),
+    (openai.NotFoundError, 404),
+    (openai.UnprocessableEntityError, 422),
+])
+def test_client_errors_are_not_retried(sleeps, cls, status):
+    client, completions = _client([_status_error(cls, status), _completion()])
+    with pytest.raises(LLMError) as info:
+        _run(client)
+    assert isinstance(info.value.__cause__, cls)
+    assert len(completions.calls) == 1
+    assert sleeps == []
+
+
+class _Items(BaseModel):
+    items: List[int] = []
+
+
+def _complete_all(client, calls):
+    """Run complete() for each (prompt, kwargs) pair on one loop."""
+    async def main():
+        try:
+            return [
+                await client.complete([{"role": "user", "content": prompt}], **kwargs)
+                for prompt, kwargs in calls
+            ]
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_exact_cache_reuses_deterministic_responses():
+    client, completions = _client([_completion('{"items": [1]}')])
+    first, second = _complete_all(client, [
+        ("hi", {"response_format": _Items}),
+        ("hi", {"response_format": _Items}),
+    ])
+    assert len(completions.calls) == 1
+    assert second.latency_ms == 0
+    assert second.parsed_any == _Items(items=[1])
+
+
+def test_exact_cache_hits_are_independent_copies():
+    client, completions = _client([_completion('{"items": [1]}')])
+
+    async def main():
+        try:
+            first = await client.complete([{"role": "user", "content": "hi"}], response_format=_Items)
+            first.parsed_any.items.append(2)
+            first.parsed_raw["items"].append(2)
+            second = await client.complete([{"role": "user", "content": "hi"}], response_format=_Items)
+            second.parsed_any.items.append(3)
+            third = await client.complete([{"role": "user", "content": "hi"}], response_format=_Items)
+            return second, third
+        finally:
+            await client.aclose()
+
+    second, third = asyncio.run(main())
+    assert len(completions.calls) == 1
+    assert second.parsed_raw == {"items": [1]}
+    assert third.parsed_any.items == [1]
+
+
+def test_exact_cache_is_keyed_on_response_format():
+    client, completions = _client([_completion('{"items": [1]}'), _completion('{"items": [2]}')])
+    _complete_all(client, [("hi", {"response_format": _Items}), ("hi", {})])
+    assert len(completions.calls) == 2
+
+
+def test_exact_cache_evicts_least_recently_used():
+    client, completions = _client([_completion(c) for c in "abc"], exact_cache_size=1)
+    results = _complete_all(client, [("a", {}), ("b", {}), ("a", {})])
+    assert [r.content for r in results] == ["a", "b", "c"]
+    assert len(completions.calls) == 3
+
+
+def test_exact_cache_can_be_disabled():
+    client, completions = _client([_completion("a"), _completion("b")], exact_cache_size=0)
+    results = _complete_all(client, [("hi", {}), ("hi", {})])
+    assert [r.content for r in results] == ["a", "b"]
+
+
+class _FixedEmbeddingCache(SemanticCache):
+    """Semantic cache that embeds every prompt to the same vector."""
+
+    def __init__(self):
+        super().__init__()
+        self.enabled = True
+        self.embedded = []
+
+    async def embed(self, text):
+        import numpy as np
+
+        self.embedded.append(text)
+        return np.ones(4) / 2
+
+
+def test_semantic_cache_serves_near_duplicate_prompts():
+    pytest.importorskip("numpy")
+    cache = _FixedEmbeddingCache()
+    client, completions = _client([_completion("a")])
+    client._semantic_cache = cache
+    results = _complete_all(client, [("first prompt", {}), ("second prompt", {})])
+    assert [r.content for r in results] == ["a", "a"]
+    assert len(completions.calls) == 1
+    assert cache.embedded == ["first prompt", "second prompt"]
+
+
+def test_positive_temperature_skips_both_caches():
+    cache = _FixedEmbeddingCache()
+    client, completions = _client([_completion("a"), _completion("b")], temperature=0.7)
+    client._semantic_cache = cache
+    results = _complete_all(client, [("hi", {}), ("hi", {})])
+    assert [r.content for r in results] == ["a", "b"]
+    assert len(completions.calls) == 2
+    assert cache.embedded == []
+    assert len(client._exact_cache) == 0
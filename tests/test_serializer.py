@@ -0,0 +1,82 @@
+"""Tests for the column-wise interactive element serializer.
+
+Expected strings are the output of the per-dict ``_serialize_element``
+implementation that ``InteractiveElementsSoA`` replaced.
+"""
+
+import pytest
+
+from softlight_automation_framework.dom.serializer import DOMSerializer
+from softlight_automation_framework.dom.views import DOMState, InteractiveElementsSoA
+
+ELEMENTS = [
+    {
+        "index": 1, "tag_name": "a", "text": "Home", "depth": 1,
+        "attributes": {"href": "/", "class": "nav"},
+        "bounds": {"x": 10.0, "y": 5.0, "width": 40.0, "height": 20.0},
+    },
+    {
+        # No bounds: sorts as (0, 0)
+        "index": 2, "tag_name": "button", "text": "Menu",
+        "attributes": {"type": "button", "aria-label": "Open menu"},
+    },
+    {
+        # Long attribute value and long text are truncated
+        "index": 3, "tag_name": "input", "depth": 7, "is_new": True,
+        "text": "t" * 120,
+        "attributes": {"placeholder": "p" * 60, "name": "q", "value": ""},
+        "bounds": {"x": 0.0, "y": 40.0, "width": 200.0, "height": 30.0},
+    },
+    {
+        # Role and name come from accessibility when not set as attributes
+        "index": 4, "tag_name": "div", "text": "Settings", "depth": 2,
+        "attributes": {"title": "Settings"},
+        "accessibility": {"role": "menuitem", "name": "n" * 60},
+        "bounds": {"x": 50.0, "y": 40.0, "width": 80.0, "height": 20.0},
+    },
+    {
+        # Accessibility does not override explicit role / aria-label
+        "index": 5, "tag_name": "span", "is_new": True,
+        "attributes": {"role": "tab", "aria-label": "Tab"},
+        "accessibility": {"role": "button", "name": "Other"},
+        "bounds": {"x": 5.0, "y": 40.0, "width": 10.0, "height": 10.0},
+    },
+    {
+        # Hidden elements are not listed
+        "index": 6, "tag_name": "a", "is_visible": False,
+        "attributes": {"href": "/hidden"},
+        "bounds": {"x": 0.0, "y": 1.0, "width": 10.0, "height": 10.0},
+    },
+]
+
+EXPECTED_LINES = [
+    "\t[1]<a href='/'>Home</a>",
+    "[2]<button aria-label='Open menu' type='button'>Menu</button>",
+    "\t\t\t\t\t*[3]<input placeholder='" + "p" * 47 + "...' name='q'>" + "t" * 97 + "...</input>",
+    "\t\t[4]<div title='Settings' role='menuitem' aria-label='" + "n" * 50 + "'>Settings</div>",
+    "*[5]<span aria-label='Tab' role='tab'></span>",
+    "[6]<a href='/hidden'></a>",
+]
+
+
+@pytest.mark.parametrize("element, expected", list(zip(ELEMENTS, EXPECTED_LINES)))
+def test_render_line_matches_legacy_output(element, expected):
+    columns = InteractiveElementsSoA.from_elements([element])
+    assert columns.render_line(0) == expected
+
+
+def test_serialize_matches_legacy_output():
+    elements = {e["index"]: e for e in ELEMENTS}
+    state = DOMState(root_node_id=0, nodes=elements, interactive_elements=elements)
+    
+    representation = DOMSerializer(state).serialize().llm_representation
+    
+    assert representation == "\n".join([
+        "[Start of page]",
+        EXPECTED_LINES[1],
+        EXPECTED_LINES[0],
+        EXPECTED_LINES[2],
+        EXPECTED_LINES[4],
+        EXPECTED_LINES[3],
+        "[End of page]",
+    ])
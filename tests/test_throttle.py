@@ -0,0 +1,101 @@
+"""Tests for the client-side token bucket."""
+
+import asyncio
+
+import pytest
+
+from softlight_automation_framework.llm import throttle
+from softlight_automation_framework.llm.throttle import TokenBucket
+
+
+class _Clock:
+    """Fake monotonic clock that asyncio.sleep advances."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(throttle.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(throttle.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_up_to_capacity(clock):
+    async def main():
+        bucket = TokenBucket(rate=2, capacity=5)
+        for _ in range(5):
+            await bucket.acquire()
+        assert clock.sleeps == []
+
+        await bucket.acquire()
+        assert clock.sleeps == [pytest.approx(0.5)]
+
+    asyncio.run(main())
+
+
+def test_refill_is_capped_at_capacity(clock):
+    async def main():
+        bucket = TokenBucket(rate=10, capacity=3)
+        await bucket.acquire(3)
+        clock.now += 60
+        await bucket.acquire(3)
+        assert clock.sleeps == []
+
+        await bucket.acquire(1)
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+    asyncio.run(main())
+
+
+def test_cost_above_capacity_is_clamped(clock):
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=4)
+        await bucket.acquire(100)
+        await bucket.acquire(100)
+        assert clock.sleeps == [pytest.approx(4)]
+
+    asyncio.run(main())
+
+
+def test_waiters_reserve_in_arrival_order(clock):
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=1)
+        await bucket.acquire()
+        # Each waiter reserves on arrival, so later waiters queue behind
+        # the earlier reservations
+        await bucket.acquire()
+        await bucket.acquire(0.5)
+        assert clock.sleeps == [pytest.approx(1), pytest.approx(0.5)]
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_returns_its_tokens(clock, monkeypatch):
+    async def cancelled_sleep(delay):
+        raise asyncio.CancelledError
+
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=2)
+        await bucket.acquire(2)
+
+        monkeypatch.setattr(throttle.asyncio, "sleep", cancelled_sleep)
+        with pytest.raises(asyncio.CancelledError):
+            await bucket.acquire(2)
+        monkeypatch.setattr(throttle.asyncio, "sleep", clock.sleep)
+
+        clock.now += 2
+        await bucket.acquire(2)
+        assert clock.sleeps == []
+
+    asyncio.run(main())